@@ -19,6 +19,7 @@ a = Analysis(
         'rumps',
         'sounddevice',
         'numpy',
+        'webrtcvad',
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,47 +1,61 @@
 """
 Main entry point for TaskPaper app.
 """
-import threading
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 
 import rumps
+from AppKit import NSWorkspace, NSWorkspaceDidWakeNotification
+from PyObjCTools import AppHelper
 
-from taskpaper.core.config import APP_NAME, REFRESH_SECONDS, TZ, has_openai_api_key
+from taskpaper.core.config import APP_NAME, REFRESH_SECONDS, ensure_dirs, get_tz, has_openai_api_key
 from taskpaper.services.auth import load_credentials, connect_google
 from taskpaper.services.calendar_service import get_today_events
 from taskpaper.core.triage import triage_events
-from taskpaper.utils.renderer import render_wallpaper
+from taskpaper.utils.renderer import prepare_display_items, render_wallpaper
 from taskpaper.utils.wallpaper_manager import (
     set_wallpaper_all_displays, 
     cleanup_old_wallpapers, 
     get_primary_screen_size, 
-    generate_wallpaper_filename
+    get_screen_layout,
+    generate_wallpaper_filename,
+    wallpaper_changed
 )
 from taskpaper.ui.config_window import ConfigWindow
 from taskpaper.ui.voice_window import show_voice_window
 from taskpaper.ui.settings import show_initial_openai_setup
-from taskpaper.voice.storage import VoiceTaskStorage
+from taskpaper.voice.storage import get_voice_storage
 
 
 class TaskPaperApp(rumps.App):
     """Main TaskPaper menubar application."""
     
     def __init__(self):
+        # Make sure app data directories exist before touching them
+        ensure_dirs()
+
         # Load credentials and set up state
         self.creds = load_credentials()
         self.paused = False
-        self.lock = threading.Lock()
+        # Single persistent worker for refreshes; at most one in flight
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskpaper-refresh")
+        self._pending_refresh = None
+        # Side worker so voice tasks load while the calendar request is in flight
+        self._voice_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskpaper-voice")
         self.config_window = None
+        self._last_render_key = None
+        self._today_cache = (None, None)  # (day ordinal, "YYYY-MM-DD")
         self.initial_config_shown = False
         
         # Initialize voice task storage
-        self.voice_storage = VoiceTaskStorage()
+        self.voice_storage = get_voice_storage()
 
         # Build menu
         self.status_item = rumps.MenuItem("● Running" if self.creds else "○ Disconnected")
+        self.pause_item = rumps.MenuItem("Pause", callback=self.toggle)
         menu = [
             self.status_item,
-            rumps.MenuItem("Pause", callback=self.toggle),
+            self.pause_item,
             None,
             rumps.MenuItem("Add Task", callback=self.add_task),
             rumps.MenuItem("Refresh Now", callback=self.refresh),
@@ -56,6 +70,11 @@ class TaskPaperApp(rumps.App):
         # Set the title with emoji icon
         self.title = "📝"
 
+        # Refresh as soon as the Mac wakes rather than waiting for the next timer fire
+        self._wake_observer = NSWorkspace.sharedWorkspace().notificationCenter().addObserverForName_object_queue_usingBlock_(
+            NSWorkspaceDidWakeNotification, None, None, self._on_wake
+        )
+
         # Start timer
         self.timer = rumps.Timer(self.tick, REFRESH_SECONDS)
         self.timer.start()
@@ -67,8 +86,8 @@ class TaskPaperApp(rumps.App):
         # Check for OpenAI API key on startup (only once)
         if not has_openai_api_key() and not self.initial_config_shown:
             # Schedule OpenAI config to show after a brief delay to let the app fully initialize
-            timer = rumps.Timer(self._show_initial_openai_config, 2)
-            timer.start()
+            self._openai_setup_timer = rumps.Timer(self._show_initial_openai_config, 2)
+            self._openai_setup_timer.start()
 
     def connect(self, _):
         """Connect to Google services."""
@@ -83,10 +102,16 @@ class TaskPaperApp(rumps.App):
         except Exception as e:
             rumps.alert(f"Failed to connect: {e}")
 
-    def toggle(self, item):
+    def toggle(self, _):
         """Toggle pause/resume."""
         self.paused = not self.paused
-        item.title = "Resume" if self.paused else "Pause"
+        self.pause_item.title = "Resume" if self.paused else "Pause"
+        
+        # Stop the refresh timer while paused so it doesn't wake the run loop
+        if self.paused:
+            self.timer.stop()
+        elif not self.timer.is_alive():
+            self.timer.start()
         self.status_item.title = "◌ Paused" if self.paused else "● Running"
 
     def refresh(self, _):
@@ -99,12 +124,23 @@ class TaskPaperApp(rumps.App):
 
     def show_settings(self, _):
         """Open settings window."""
-        if self.config_window is None or not self.config_window.is_open():
-            self.config_window = ConfigWindow()
-        self.config_window.show()
+        if self.config_window is not None and self.config_window.is_open():
+            return
+        
+        self.config_window = ConfigWindow()
+        try:
+            self.config_window.show()
+        finally:
+            # show() blocks until closed; don't keep the window alive between uses
+            self.config_window = None
     
-    def _show_initial_openai_config(self, _):
+    def _show_initial_openai_config(self, sender):
         """Show OpenAI configuration on first startup."""
+        # One-shot: stop the timer so the setup dialog isn't re-shown every 2s
+        sender.stop()
+        if self.initial_config_shown:
+            return
+        
         try:
             self.initial_config_shown = True
             show_initial_openai_setup()
@@ -113,57 +149,88 @@ class TaskPaperApp(rumps.App):
             print(f"Error showing initial OpenAI config: {e}")
 
     def tick(self, _, force_notification: bool = False):
-        """Main refresh loop."""
+        """Main refresh loop - hands the refresh work to the background worker."""
         if self.paused:
             return
-        if not self.lock.acquire(blocking=False):
+        if self._pending_refresh is not None and not self._pending_refresh.done():
             return  # Skip if previous run still working
 
+        # Screen geometry must be read on the main thread (cached by wallpaper_manager)
+        screen_size = get_primary_screen_size()
+        screen_layout = get_screen_layout()
+        self._pending_refresh = self._executor.submit(
+            self._tick_work, screen_size, screen_layout, force_notification
+        )
+
+    def _tick_work(self, screen_size, screen_layout, force_notification: bool):
+        """Fetch tasks and regenerate the wallpaper (background thread)."""
         try:
             # Get calendar data (if connected)
-            today = dt.datetime.now(TZ).strftime("%Y-%m-%d")
+            now = dt.datetime.now(get_tz())
+            ordinal = now.toordinal()
+            if self._today_cache[0] != ordinal:
+                self._today_cache = (ordinal, now.strftime("%Y-%m-%d"))
+            today = self._today_cache[1]
             events = []
             calendar_tasks = []
             
+            # Get voice tasks (in parallel with the calendar fetch + triage)
+            voice_future = self._voice_executor.submit(self._get_voice_tasks)
+            
             if self.creds:
                 events = get_today_events(self.creds)
                 calendar_tasks = triage_events(today, events)
 
-            # Get voice tasks
-            voice_tasks = self._get_voice_tasks()
+            voice_tasks = voice_future.result()
             
             # Combine tasks for wallpaper
             all_tasks = self._combine_tasks(calendar_tasks, voice_tasks)
 
             # Only regenerate wallpaper if we have tasks or are connected to calendar
             if all_tasks or self.creds:
-                screen_size = get_primary_screen_size()
-                wallpaper_path = generate_wallpaper_filename()
-                
-                render_wallpaper(all_tasks, events, screen_size, wallpaper_path)
-                set_wallpaper_all_displays(wallpaper_path)
-                cleanup_old_wallpapers(wallpaper_path)
+                # Skip the render + wallpaper swap when nothing visible changed.
+                # The wallpaper only depends on the display items, whether there
+                # are any events (empty-state message) and the screen layout; the
+                # layout covers the primary size and also changes when a display
+                # is attached, which needs the wallpaper set on it too.
+                display_items = prepare_display_items(all_tasks, events)
+                render_key = (tuple(display_items), bool(events), screen_layout)
+                if force_notification or render_key != self._last_render_key:
+                    wallpaper_path = generate_wallpaper_filename()
+                    
+                    render_wallpaper(all_tasks, events, screen_size, wallpaper_path, display_items)
+                    # Forced refreshes often render the same pixels; keep the current file then
+                    if wallpaper_changed(wallpaper_path):
+                        AppHelper.callAfter(set_wallpaper_all_displays, wallpaper_path)
+                        cleanup_old_wallpapers(wallpaper_path)
+                    self._last_render_key = render_key
 
             if force_notification:
-                rumps.notification(APP_NAME, "", "Wallpaper updated.")
+                AppHelper.callAfter(rumps.notification, APP_NAME, "", "Wallpaper updated.")
             
             # Update status
             if self.creds:
-                self.status_item.title = "● Running"
+                AppHelper.callAfter(self._set_status, "● Running")
             else:
-                self.status_item.title = "○ Disconnected"
+                AppHelper.callAfter(self._set_status, "○ Disconnected")
             
         except Exception as e:
             print("Error:", e)
-            self.status_item.title = "⚠︎ Error"
-        finally:
-            self.lock.release()
+            AppHelper.callAfter(self._set_status, "⚠︎ Error")
+    
+    def _on_wake(self, _notification):
+        """Refresh right after the Mac wakes from sleep."""
+        self.tick(None)
+    
+    def _set_status(self, title: str):
+        """Update the status menu item (main thread only)."""
+        self.status_item.title = title
     
     def _on_voice_tasks_added(self, new_tasks):
         """Callback triggered when new voice tasks are added."""
         try:
-            # Trigger immediate wallpaper refresh
-            self.tick(None, force_notification=False)
+            # Trigger immediate wallpaper refresh (called from a worker thread)
+            AppHelper.callAfter(self.tick, None)
             print(f"Wallpaper refreshed after adding {len(new_tasks)} voice task(s)")
         except Exception as e:
             print(f"Error refreshing wallpaper after voice tasks added: {e}")
@@ -171,23 +238,9 @@ class TaskPaperApp(rumps.App):
     def _get_voice_tasks(self):
         """Get today's voice tasks and convert them to UrgentTask format."""
         try:
-            from taskpaper.core.models import UrgentTask
-            
-            voice_tasks = self.voice_storage.get_today_tasks()
-            urgent_tasks = []
-            
-            for voice_task in voice_tasks:
-                # Convert VoiceTaskExtended to UrgentTask format
-                urgent_task = UrgentTask(
-                    title=voice_task.title,
-                    source="voice",
-                    time=voice_task.start_time,  # Use start_time for display
-                    priority=voice_task.priority,
-                    link=None  # Voice tasks don't have links
-                )
-                urgent_tasks.append(urgent_task)
-            
-            return urgent_tasks
+            # Conversions are memoized on the (cached) stored tasks, so repeat
+            # refreshes reuse the same UrgentTask objects
+            return [voice_task.to_urgent_task() for voice_task in self.voice_storage.get_today_tasks()]
             
         except Exception as e:
             print(f"Error loading voice tasks: {e}")
@@ -203,26 +256,8 @@ class TaskPaperApp(rumps.App):
         # Add voice tasks
         all_tasks.extend(voice_tasks)
         
-        # Sort by priority (1=highest priority) and then by time
-        def task_sort_key(task):
-            # Priority comes first (1 is highest priority, so lower numbers first)
-            priority = task.priority
-            
-            # Time comes second - tasks with time come before tasks without time
-            time_priority = 0 if task.time else 1
-            
-            # Convert time to minutes for sorting (if available)
-            time_minutes = 0
-            if task.time:
-                try:
-                    hours, minutes = map(int, task.time.split(':'))
-                    time_minutes = hours * 60 + minutes
-                except:
-                    time_minutes = 0
-            
-            return (priority, time_priority, time_minutes)
-        
-        all_tasks.sort(key=task_sort_key)
+        # Sort by priority (1=highest priority), then timed tasks by time, then untimed
+        all_tasks.sort(key=lambda t: (t.priority, t.time_min is None, t.time_min or 0))
         
         # Limit to 6 tasks total (same as original limit)
         return all_tasks[:6]
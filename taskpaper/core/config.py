@@ -4,8 +4,15 @@ Configuration constants for TaskPaper app.
 import os
 import json
 import datetime as dt
+import functools
 from typing import Optional, Dict, Any
 
+# Optional fast JSON library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # App configuration
 APP_NAME = "TaskPaper"
 REFRESH_SECONDS = 60
@@ -15,21 +22,21 @@ SCOPES = [
     "https://www.googleapis.com/auth/calendar.readonly",
 ]
 
-# Directories and paths
+# Directories and paths (created lazily by ensure_dirs)
 APP_DIR = os.path.join(os.path.expanduser("~"), "Library", "Application Support", APP_NAME)
-os.makedirs(APP_DIR, exist_ok=True)
 
 TOKEN_PATH = os.path.join(APP_DIR, "token.json")
 CREDS_PATH = os.path.join(os.path.dirname(__file__), "credentials.json")
 WALL_DIR = os.path.join(APP_DIR, "wallpapers")
-os.makedirs(WALL_DIR, exist_ok=True)
 
 # Voice recording directories
 VOICE_DIR = os.path.join(APP_DIR, "voice_recordings")
-os.makedirs(VOICE_DIR, exist_ok=True)
 
-# Timezone
-TZ = dt.datetime.now().astimezone().tzinfo
+# Timezone (resolved lazily, see get_tz)
+@functools.lru_cache(maxsize=None)
+def get_tz() -> dt.tzinfo:
+    """Get the local timezone, computed once on first use."""
+    return dt.datetime.now().astimezone().tzinfo
 
 # Wallpaper settings
 MAX_CARD_WIDTH = 600
@@ -38,9 +45,23 @@ WALLPAPER_KEEP_COUNT = 3
 
 # Voice recording settings
 VOICE_SAMPLE_RATE = 44100  # CD quality
+VOICE_UPLOAD_SAMPLE_RATE = 16000  # Whisper's native rate; recordings are saved and uploaded at this rate
 VOICE_CHANNELS = 1  # Mono
 VOICE_FORMAT = "wav"  # WAV format for quality
 VOICE_KEEP_COUNT = 10  # Number of recordings to keep
+VOICE_BUFFER_SECONDS = 60  # Preallocated recording buffer length (grows if exceeded)
+VOICE_CHUNK_SECONDS = 10  # Audio sent for transcription in blocks of this length while recording
+
+# Transcripts with none of these words (or any digit) skip GPT task extraction.
+# Matched case-insensitively as word prefixes; set to () to always call GPT.
+VOICE_TASK_KEYWORDS = (
+    "remind", "remember", "forget", "todo", "to do", "task", "schedule", "plan",
+    "today", "tonight", "tomorrow", "week", "month", "morning", "afternoon", "evening",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "noon", "midnight", "o'clock", "deadline", "due", "appointment", "meeting",
+    "call", "email", "text", "message", "buy", "pick up", "send", "pay", "book",
+    "finish", "submit", "review", "prepare", "need", "have to", "must", "should", "gotta",
+)
 
 # Configuration file path
 CONFIG_PATH = os.path.join(APP_DIR, "config.json")
@@ -53,6 +74,7 @@ LLM_SYSTEM_PROMPT = (
     "Prefer: meetings starting soon, high priority events, explicit deadlines/times.\n"
     "Return strict JSON array: [{\"title\": str, \"source\": \"calendar\", \"time\": \"HH:MM\"|null, \"priority\": 1..5, \"link\": str|null}]\n"
 )
+LLM_SYSTEM_MESSAGE = {"role": "system", "content": LLM_SYSTEM_PROMPT}
 
 # Voice processing LLM prompt
 VOICE_SYSTEM_PROMPT = (
@@ -78,23 +100,65 @@ VOICE_SYSTEM_PROMPT = (
 )
 
 
+# Directory setup
+_dirs_ready = False
+
+
+def ensure_dirs():
+    """Create the app data directories on first use."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for path in (APP_DIR, WALL_DIR, VOICE_DIR):
+        os.makedirs(path, exist_ok=True)
+    _dirs_ready = True
+
+
 # Configuration management functions
+# Parsed config cache, invalidated when the file's mtime changes
+_CONFIG_CACHE: Dict[str, Any] = {"mtime": None, "data": {}}
+
+
 def load_config() -> Dict[str, Any]:
-    """Load configuration from JSON file."""
+    """Load configuration from JSON file (cached until the file changes)."""
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        return {}
+    
+    if mtime == _CONFIG_CACHE["mtime"]:
+        return dict(_CONFIG_CACHE["data"])
+    
     try:
-        if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, 'r') as f:
-                return json.load(f)
+        with open(CONFIG_PATH, 'rb') as f:
+            data = f.read()
+        config = orjson.loads(data) if orjson else json.loads(data)
     except Exception:
-        pass
-    return {}
+        return {}
+    
+    _CONFIG_CACHE["mtime"] = mtime
+    _CONFIG_CACHE["data"] = config
+    return dict(config)
 
 
 def save_config(config: Dict[str, Any]) -> bool:
     """Save configuration to JSON file."""
     try:
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(config, f, indent=2)
+        ensure_dirs()
+        
+        # Write to a temp file and swap it in so a crash can't truncate the config
+        tmp_path = CONFIG_PATH + ".tmp"
+        if orjson:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, 'w') as f:
+                json.dump(config, f, indent=2)
+        os.replace(tmp_path, CONFIG_PATH)
+        
+        # Refresh the cache so the next lookup doesn't re-read the file
+        _CONFIG_CACHE["mtime"] = os.stat(CONFIG_PATH).st_mtime_ns
+        _CONFIG_CACHE["data"] = dict(config)
         return True
     except Exception:
         return False
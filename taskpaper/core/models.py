@@ -2,11 +2,28 @@
 Data models for TaskPaper app.
 """
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+def parse_time_minutes(time_str: Optional[str]) -> Optional[int]:
+    """Parse 'HH:MM' (24h) or 'H:MM AM/PM' into minutes since midnight."""
+    if not time_str:
+        return None
+    for fmt in ("%H:%M", "%I:%M %p"):
+        try:
+            parsed = dt.datetime.strptime(time_str.strip(), fmt)
+            return parsed.hour * 60 + parsed.minute
+        except ValueError:
+            continue
+    return None
+
+
+def _format_hm(when: Optional[dt.datetime]) -> str:
+    return f"{when.hour:02d}:{when.minute:02d}" if when else "--"
+
+
+@dataclass(frozen=True, slots=True)
 class CalItem:
     """Calendar event item."""
     id: str
@@ -15,9 +32,16 @@ class CalItem:
     summary: str
     location: Optional[str] = None
     hangoutLink: Optional[str] = None
+    start_hm: str = field(default="--", init=False, repr=False, compare=False)
+    end_hm: str = field(default="--", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Format once; the triage prompt, heuristics and renderer all reuse these
+        object.__setattr__(self, "start_hm", _format_hm(self.start))
+        object.__setattr__(self, "end_hm", _format_hm(self.end))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UrgentTask:
     """Urgent task extracted from calendar events."""
     title: str
@@ -25,9 +49,14 @@ class UrgentTask:
     time: Optional[str]  # 'HH:MM' 24h or None
     priority: int        # 1..5
     link: Optional[str] = None
+    time_min: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Parse once so sorting doesn't re-split the time string
+        object.__setattr__(self, "time_min", parse_time_minutes(self.time))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DisplayItem:
     """Item to display on wallpaper."""
     text: str
@@ -48,7 +77,7 @@ class VoiceRecording:
     processed: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VoiceTask:
     """Task generated from voice recording."""
     title: str
@@ -3,14 +3,20 @@ Task triage using LLM and heuristic fallbacks for TaskPaper.
 """
 import json
 import datetime as dt
-from typing import List, Optional
+import threading
+from typing import Dict, Iterator, List, Optional
 import os
 
-from taskpaper.core.config import LLM_SYSTEM_PROMPT, TZ, get_openai_api_key
+from taskpaper.core.config import LLM_SYSTEM_MESSAGE, get_openai_api_key, get_tz
 from taskpaper.core.models import CalItem, UrgentTask
+from taskpaper.utils.json_stream import iter_array_items
 
 # Optional LLM (OpenAI)
 OPENAI = None
+_client_lock = threading.Lock()
+
+# Routes triage calls to the same prompt-cache shard; bump if the system prompt changes
+_PROMPT_CACHE_KEY = "taskpaper-triage-v1"
 try:
     from openai import OpenAI
     api_key = get_openai_api_key()
@@ -23,15 +29,16 @@ except Exception:
 def reinitialize_openai():
     """Reinitialize OpenAI client with current API key from config."""
     global OPENAI
-    try:
-        from openai import OpenAI
-        api_key = get_openai_api_key()
-        if api_key:
-            OPENAI = OpenAI(api_key=api_key)
-        else:
+    with _client_lock:
+        try:
+            from openai import OpenAI
+            api_key = get_openai_api_key()
+            if api_key:
+                OPENAI = OpenAI(api_key=api_key)
+            else:
+                OPENAI = None
+        except Exception:
             OPENAI = None
-    except Exception:
-        OPENAI = None
 
 
 def triage_events(today_str: str, events: List[CalItem]) -> List[UrgentTask]:
@@ -47,7 +54,7 @@ def triage_events(today_str: str, events: List[CalItem]) -> List[UrgentTask]:
     """
     # Build prompt for LLM
     event_text = "\n".join(
-        f"- [event] {event.start:%H:%M}-{event.end:%H:%M} {event.summary}"
+        f"- [event] {event.start_hm}-{event.end_hm} {event.summary}"
         for event in events
     )
     user_prompt = f"TODAY: {today_str}\n\nCALENDAR (today):\n{event_text}\n"
@@ -69,16 +76,46 @@ def _try_llm_triage(user_prompt: str) -> Optional[List[dict]]:
         return None
         
     try:
-        res = OPENAI.chat.completions.create(
+        stream = OPENAI.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": LLM_SYSTEM_PROMPT},
+                LLM_SYSTEM_MESSAGE,
                 {"role": "user", "content": user_prompt}
             ],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY},
+            stream=True
         )
-        content = res.choices[0].message.content
-        parsed = json.loads(content)
+        parts: List[str] = []
+        
+        def deltas() -> Iterator[str]:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+        
+        try:
+            # Take tasks as soon as each object closes; stop reading after 6
+            # distinct titles, since _parse_tasks drops repeats
+            tasks = []
+            titles = set()
+            text = deltas()
+            for raw in iter_array_items(text):
+                item = json.loads(raw)
+                tasks.append(item)
+                titles.add(_task_title(item))
+                if len(titles) >= 6:
+                    break
+            if tasks:
+                return tasks
+            
+            # No array items streamed; read the rest and parse the whole reply
+            for _ in text:
+                pass
+        finally:
+            stream.close()
+        
+        parsed = json.loads("".join(parts))
         
         # Accept either an array or an object with "tasks"/"items"
         if isinstance(parsed, list):
@@ -94,50 +131,56 @@ def _try_llm_triage(user_prompt: str) -> Optional[List[dict]]:
 def _heuristic_triage(events: List[CalItem]) -> List[dict]:
     """Fallback heuristic triage for near-term meetings."""
     tasks_json = []
-    now = dt.datetime.now(TZ)
+    now = dt.datetime.now(get_tz())
+    cutoff = now + dt.timedelta(hours=3)
     
-    for event in events:
+    # The API already orders by start time; sorting sorted input is linear
+    for event in sorted(events, key=lambda e: e.start):
         # Skip events that have already ended
         if event.end <= now:
             continue
-            
+        
         # Meetings starting within next 3 hours, or ongoing
-        seconds_until_start = (event.start - now).total_seconds()
-        if seconds_until_start <= 3 * 3600:  # 3 hours
-            tasks_json.append({
-                "title": f"Meeting: {event.summary}",
-                "source": "calendar",
-                "time": event.start.strftime("%H:%M"),
-                "priority": 5,
-                "link": event.hangoutLink
-            })
+        if event.start > cutoff:
+            break
+        
+        tasks_json.append({
+            "title": f"Meeting: {event.summary}",
+            "source": "calendar",
+            "time": event.start_hm,
+            "priority": 5,
+            "link": event.hangoutLink
+        })
+        if len(tasks_json) == 6:
+            break
     
-    return tasks_json[:6]
+    return tasks_json
+
+
+def _task_title(item: dict) -> str:
+    """Display title of a task dict; tasks are deduplicated on this."""
+    return (item.get("title") or "(no title)")[:140]
 
 
 def _parse_tasks(tasks_json: List[dict]) -> List[UrgentTask]:
     """Parse task dictionaries into UrgentTask objects."""
-    tasks: List[UrgentTask] = []
+    # Deduplicate by title, keep order (dicts preserve insertion order)
+    unique: Dict[str, UrgentTask] = {}
     
     for item in tasks_json:
         try:
             task = UrgentTask(
-                title=(item.get("title") or "(no title)")[:140],
+                title=_task_title(item),
                 source=(item.get("source") or "calendar")[:16],
                 time=item.get("time"),
                 priority=int(item.get("priority") or 3),
                 link=item.get("link")
             )
-            tasks.append(task)
         except Exception:
             continue  # Skip invalid tasks
-
-    # Deduplicate by title, keep order
-    seen = set()
-    unique_tasks = []
-    for task in tasks:
-        if task.title not in seen:
-            seen.add(task.title)
-            unique_tasks.append(task)
+        
+        unique.setdefault(task.title, task)
+        if len(unique) >= 6:
+            break
     
-    return unique_tasks[:6]
+    return list(unique.values())
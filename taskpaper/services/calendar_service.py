@@ -6,10 +6,25 @@ from typing import List
 
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
-from taskpaper.core.config import TZ
+from taskpaper.core.config import get_tz
 from taskpaper.core.models import CalItem
 
+# Calendar service reused across refreshes so its HTTP connection stays alive
+_service_cache = {"creds": None, "svc": None}
+
+# Last events.list response, reused when Calendar answers 304 Not Modified
+_events_cache = {"key": None, "etag": None, "items": []}
+
+
+def get_calendar_service(creds: Credentials):
+    """Get the Calendar API service for creds, rebuilding only when creds change."""
+    if _service_cache["svc"] is None or _service_cache["creds"] is not creds:
+        _service_cache["svc"] = build("calendar", "v3", credentials=creds, cache_discovery=False)
+        _service_cache["creds"] = creds
+    return _service_cache["svc"]
+
 
 def get_today_events(creds: Credentials) -> List[CalItem]:
     """
@@ -21,35 +36,51 @@ def get_today_events(creds: Credentials) -> List[CalItem]:
     Returns:
         List of CalItem objects for events that haven't ended yet
     """
-    svc = build("calendar", "v3", credentials=creds, cache_discovery=False)
-    now = dt.datetime.now(TZ)
+    svc = get_calendar_service(creds)
+    tz = get_tz()
+    now = dt.datetime.now(tz)
     
     # Define today's time range
-    start = dt.datetime(now.year, now.month, now.day, 0, 0, 0, tzinfo=TZ).isoformat()
-    end = dt.datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=TZ).isoformat()
+    start = dt.datetime(now.year, now.month, now.day, 0, 0, 0, tzinfo=tz).isoformat()
+    end = dt.datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=tz).isoformat()
     
     # Fetch events
-    resp = svc.events().list(
+    request = svc.events().list(
         calendarId="primary",
         timeMin=start,
         timeMax=end,
         singleEvents=True,
-        orderBy="startTime"
-    ).execute()
+        orderBy="startTime",
+        # Partial response: only the fields CalItem needs
+        fields="etag,items(id,start,end,summary,location,hangoutLink)"
+    )
+    
+    # Conditional GET: unchanged calendars come back as an empty 304
+    cache_key = (start, end)
+    if _events_cache["key"] == cache_key and _events_cache["etag"]:
+        request.headers["If-None-Match"] = _events_cache["etag"]
+    
+    try:
+        resp = request.execute()
+        items = resp.get("items", [])
+        _events_cache.update(key=cache_key, etag=resp.get("etag"), items=items)
+    except HttpError as e:
+        if e.resp.status != 304:
+            raise
+        items = _events_cache["items"]
     
-    items = resp.get("items", [])
     events: List[CalItem] = []
-    current_time = dt.datetime.now(TZ)
+    current_time = dt.datetime.now(tz)
 
     def parse_datetime(obj_key: str, event: dict) -> dt.datetime:
         """Parse datetime from calendar event."""
         val = event.get(obj_key, {})
         if "dateTime" in val:
             # Handle Z or offset
-            return dt.datetime.fromisoformat(val["dateTime"].replace("Z", "+00:00")).astimezone(TZ)
+            return dt.datetime.fromisoformat(val["dateTime"].replace("Z", "+00:00")).astimezone(tz)
         if "date" in val:
-            return dt.datetime.fromisoformat(val["date"] + "T00:00:00").replace(tzinfo=TZ)
-        return dt.datetime.now(TZ)
+            return dt.datetime.fromisoformat(val["date"] + "T00:00:00").replace(tzinfo=tz)
+        return dt.datetime.now(tz)
 
     for event in items:
         start_time, end_time = parse_datetime("start", event), parse_datetime("end", event)
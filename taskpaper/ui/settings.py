@@ -4,6 +4,7 @@ Settings window for TaskPaper - handles general configuration like OpenAI API ke
 import rumps
 from taskpaper.core.config import get_openai_api_key, set_openai_api_key, has_openai_api_key
 from taskpaper.core.triage import reinitialize_openai
+from taskpaper.voice.processor import reinitialize_openai as reinitialize_voice_openai
 
 
 class SettingsWindow(rumps.Window):
@@ -86,8 +87,9 @@ class SettingsWindow(rumps.Window):
             if self._test_api_key(api_key):
                 # Save the API key
                 if set_openai_api_key(api_key):
-                    # Reinitialize OpenAI client
+                    # Reinitialize OpenAI clients
                     reinitialize_openai()
+                    reinitialize_voice_openai()
                     rumps.notification(
                         "TaskPaper", 
                         "OpenAI Configured", 
@@ -1,6 +1,7 @@
 """
 Voice recording functionality for TaskPaper.
 """
+import io
 import os
 import time
 import uuid
@@ -9,8 +10,12 @@ import threading
 import datetime as dt
 from typing import Optional, Callable, Any
 
-from taskpaper.core.config import VOICE_DIR, VOICE_SAMPLE_RATE, VOICE_CHANNELS, VOICE_FORMAT
+from taskpaper.core.config import (
+    VOICE_DIR, VOICE_SAMPLE_RATE, VOICE_CHANNELS, VOICE_FORMAT, VOICE_KEEP_COUNT, VOICE_BUFFER_SECONDS,
+    VOICE_CHUNK_SECONDS, VOICE_UPLOAD_SAMPLE_RATE
+)
 from taskpaper.core.models import VoiceRecording
+from taskpaper.utils.audio import resample_mono
 
 # Audio recording library
 try:
@@ -28,8 +33,12 @@ class VoiceRecorder:
     
     def __init__(self):
         self.is_recording = False
-        self.recording_data = []
+        self.recording_buffer = None  # Preallocated (frames, channels) float32 array
+        self.frames_recorded = 0
         self.recording_thread = None
+        self._stop_event = threading.Event()
+        self._on_chunk = None
+        self._chunk_start = 0  # First frame not yet passed to _on_chunk
         self.current_recording = None
         self.start_time = None
         
@@ -56,12 +65,17 @@ class VoiceRecorder:
         except Exception:
             return []
     
-    def start_recording(self, device_id: Optional[int] = None) -> bool:
+    def start_recording(self, device_id: Optional[int] = None,
+                        on_chunk: Optional[Callable[[Any], None]] = None) -> bool:
         """
         Start voice recording.
         
         Args:
             device_id: Audio device ID, None for default
+            on_chunk: Optional callback that receives a copy of each new block of
+                float32 frames, roughly every VOICE_CHUNK_SECONDS while recording;
+                if any block was passed on, the remainder follows when recording
+                stops (recordings shorter than one chunk never reach it)
             
         Returns:
             True if recording started successfully
@@ -87,9 +101,15 @@ class VoiceRecorder:
             )
             
             # Initialize recording
-            self.recording_data = []
+            self.recording_buffer = np.empty(
+                (VOICE_SAMPLE_RATE * VOICE_BUFFER_SECONDS, VOICE_CHANNELS), dtype=np.float32
+            )
+            self.frames_recorded = 0
+            self._on_chunk = on_chunk
+            self._chunk_start = 0
             self.is_recording = True
             self.start_time = time.time()
+            self._stop_event.clear()
             
             # Start recording in separate thread
             self.recording_thread = threading.Thread(
@@ -119,6 +139,7 @@ class VoiceRecorder:
         try:
             # Stop recording
             self.is_recording = False
+            self._stop_event.set()
             
             # Wait for recording thread to finish
             if self.recording_thread and self.recording_thread.is_alive():
@@ -130,28 +151,29 @@ class VoiceRecorder:
                 self.current_recording.duration = duration
             
             # Save audio file
-            if self.recording_data and len(self.recording_data) > 0:
+            if self.frames_recorded > 0:
+                # Hand over the tail before saving; the save scales the buffer in place.
+                # Short recordings emit nothing, leaving them to whole-file processing.
+                if self._chunk_start > 0:
+                    self._emit_chunk()
                 self._save_audio_file(
                     self.current_recording.path,
-                    np.concatenate(self.recording_data, axis=0)
+                    self.recording_buffer[:self.frames_recorded]
                 )
                 
                 recording = self.current_recording
-                self.current_recording = None
-                self.recording_data = []
+                self._reset_buffer()
                 
                 return recording
             else:
                 # No data recorded
-                self.current_recording = None
-                self.recording_data = []
+                self._reset_buffer()
                 return None
                 
         except Exception as e:
             print(f"Failed to stop recording: {e}")
             self.is_recording = False
-            self.current_recording = None
-            self.recording_data = []
+            self._reset_buffer()
             return None
     
     def cancel_recording(self) -> bool:
@@ -166,14 +188,14 @@ class VoiceRecorder:
             
         try:
             self.is_recording = False
+            self._stop_event.set()
             
             # Wait for recording thread to finish
             if self.recording_thread and self.recording_thread.is_alive():
                 self.recording_thread.join(timeout=2.0)
             
             # Clean up
-            self.current_recording = None
-            self.recording_data = []
+            self._reset_buffer()
             
             return True
             
@@ -193,7 +215,7 @@ class VoiceRecorder:
                 if status:
                     print(f"Recording status: {status}")
                 if self.is_recording:
-                    self.recording_data.append(indata.copy())
+                    self._append_frames(indata)
             
             # Start recording stream
             with sd.InputStream(
@@ -203,31 +225,138 @@ class VoiceRecorder:
                 samplerate=VOICE_SAMPLE_RATE,
                 dtype=np.float32
             ):
-                while self.is_recording:
-                    sd.sleep(100)  # Sleep 100ms
+                # Block until stop/cancel instead of polling the flag, waking only
+                # to pass completed chunks on when a chunk listener is installed
+                if self._on_chunk is None:
+                    self._stop_event.wait()
+                else:
+                    while not self._stop_event.wait(VOICE_CHUNK_SECONDS):
+                        self._emit_chunk(split_at_pause=True)
                     
         except Exception as e:
             print(f"Recording error: {e}")
             self.is_recording = False
     
+    def _append_frames(self, frames: Any):
+        """Copy a block of input frames into the recording buffer, growing it if full."""
+        start = self.frames_recorded
+        end = start + len(frames)
+        if end > len(self.recording_buffer):
+            grown = np.empty((max(end, 2 * len(self.recording_buffer)), VOICE_CHANNELS), dtype=np.float32)
+            grown[:start] = self.recording_buffer[:start]
+            self.recording_buffer = grown
+        self.recording_buffer[start:end] = frames
+        self.frames_recorded = end
+    
+    def _emit_chunk(self, split_at_pause: bool = False):
+        """
+        Pass frames recorded since the last chunk to the chunk listener.
+        
+        With split_at_pause, the chunk ends at the quietest point of its last
+        SPLIT_SEARCH_SECONDS rather than mid-word; the rest carries over to
+        the next chunk.
+        """
+        end = self.frames_recorded
+        if self._on_chunk is None or end <= self._chunk_start:
+            return
+        buffer = self.recording_buffer
+        if split_at_pause:
+            end = self._chunk_start + _quietest_split(
+                buffer[self._chunk_start:end],
+                int(SPLIT_SEARCH_SECONDS * VOICE_SAMPLE_RATE),
+                int(SPLIT_WINDOW_SECONDS * VOICE_SAMPLE_RATE)
+            )
+        chunk = buffer[self._chunk_start:end].copy()
+        self._chunk_start = end
+        try:
+            self._on_chunk(chunk)
+        except Exception as e:
+            print(f"Error in on_chunk callback: {e}")
+    
+    def _reset_buffer(self):
+        """Drop the current recording and release its audio buffer."""
+        self.current_recording = None
+        self.recording_buffer = None
+        self.frames_recorded = 0
+        self._on_chunk = None
+        self._chunk_start = 0
+    
     def _save_audio_file(self, filepath: str, audio_data: Any):
-        """Save recorded audio data to WAV file."""
+        """
+        Save recorded audio data as a WAV file ready for upload.
+        
+        The recording is stored as 16 kHz mono, the rate Whisper resamples to
+        anyway, so it can be sent as-is with a third of the bytes.
+        """
         try:
-            # Convert float32 to int16
-            audio_int16 = (audio_data * 32767).astype(np.int16)
-            
-            # Save as WAV file
-            with wave.open(filepath, 'wb') as wav_file:
-                wav_file.setnchannels(VOICE_CHANNELS)
-                wav_file.setsampwidth(2)  # 2 bytes for int16
-                wav_file.setframerate(VOICE_SAMPLE_RATE)
-                wav_file.writeframes(audio_int16.tobytes())
+            with open(filepath, 'wb', buffering=1 << 16) as raw_file:
+                _write_wav(raw_file, resample_mono(audio_data, VOICE_SAMPLE_RATE, VOICE_UPLOAD_SAMPLE_RATE),
+                           VOICE_UPLOAD_SAMPLE_RATE)
                 
         except Exception as e:
             print(f"Failed to save audio file: {e}")
             raise
 
 
+# Live chunks are cut at the quietest 20 ms window in the last 1.5 s before the boundary
+SPLIT_SEARCH_SECONDS = 1.5
+SPLIT_WINDOW_SECONDS = 0.02
+
+
+def _quietest_split(audio_data: Any, search_frames: int, window_frames: int) -> int:
+    """Frame index at the middle of the lowest-energy window within the last search_frames."""
+    start = max(0, len(audio_data) - search_frames)
+    windows = (len(audio_data) - start) // window_frames
+    if windows < 2:
+        return len(audio_data)
+    tail = audio_data[start:start + windows * window_frames]
+    energy = np.square(tail).reshape(windows, -1).mean(axis=1)
+    return start + int(np.argmin(energy)) * window_frames + window_frames // 2
+
+
+def _write_wav(file_obj: Any, audio_data: Any, sample_rate: int = VOICE_SAMPLE_RATE):
+    """Write float32 frames as 16-bit PCM WAV, clipping and scaling audio_data in place."""
+    # Convert float32 to int16, saturating out-of-range samples instead of wrapping
+    np.clip(audio_data, -1.0, 1.0, out=audio_data)
+    np.multiply(audio_data, 32767, out=audio_data)
+    audio_int16 = audio_data.astype(np.int16)
+    
+    # Declaring nframes up front lets the header be written once, and
+    # writeframesraw takes the array buffer directly (no tobytes copy).
+    with wave.open(file_obj, 'wb') as wav_file:
+        wav_file.setnchannels(audio_int16.shape[1] if audio_int16.ndim > 1 else 1)
+        wav_file.setsampwidth(2)  # 2 bytes for int16
+        wav_file.setframerate(sample_rate)
+        wav_file.setnframes(len(audio_int16))
+        wav_file.writeframesraw(audio_int16)
+
+
+def encode_wav(audio_data: Any, sample_rate: int = VOICE_SAMPLE_RATE) -> bytes:
+    """
+    Encode float32 frames as in-memory WAV bytes.
+    
+    A sample_rate below the recording rate gives mono audio resampled to that
+    rate (e.g. for upload); otherwise audio_data is scaled in place.
+    """
+    if sample_rate != VOICE_SAMPLE_RATE:
+        audio_data = resample_mono(audio_data, VOICE_SAMPLE_RATE, sample_rate)
+    buffer = io.BytesIO()
+    _write_wav(buffer, audio_data, sample_rate)
+    return buffer.getvalue()
+
+
+# Process-wide recorder shared by all voice windows
+_voice_recorder: Optional[VoiceRecorder] = None
+
+
+def get_voice_recorder() -> VoiceRecorder:
+    """Get the shared VoiceRecorder instance, creating it on first use."""
+    global _voice_recorder
+    if _voice_recorder is None:
+        _voice_recorder = VoiceRecorder()
+    return _voice_recorder
+
+
 def cleanup_old_recordings(keep_count: int = None):
     """
     Clean up old voice recordings, keeping only the most recent ones.
@@ -236,24 +365,25 @@ def cleanup_old_recordings(keep_count: int = None):
         keep_count: Number of recordings to keep, uses config default if None
     """
     if keep_count is None:
-        from taskpaper.core.config import VOICE_KEEP_COUNT
         keep_count = VOICE_KEEP_COUNT
     
     try:
-        # Get all recording files
-        files = []
-        for filename in os.listdir(VOICE_DIR):
-            if filename.startswith('voice_') and filename.endswith(f'.{VOICE_FORMAT}'):
-                filepath = os.path.join(VOICE_DIR, filename)
-                if os.path.isfile(filepath):
-                    files.append(filepath)
+        # Get all recording files; DirEntry caches the stat result
+        suffix = f'.{VOICE_FORMAT}'
+        with os.scandir(VOICE_DIR) as it:
+            files = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.name.startswith('voice_') and entry.name.endswith(suffix)
+                and entry.is_file(follow_symlinks=False)
+            ]
         
         # Sort by modification time (newest first)
-        files.sort(key=os.path.getmtime, reverse=True)
+        files.sort(reverse=True)
         
         # Delete files beyond keep_count
         files_to_delete = files[keep_count:]
-        for filepath in files_to_delete:
+        for _, filepath in files_to_delete:
             try:
                 os.remove(filepath)
             except OSError:
@@ -2,129 +2,209 @@
 Voice recording window for TaskPaper.
 """
 import rumps
-import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from taskpaper.ui.voice_recorder import VoiceRecorder, cleanup_old_recordings
+import objc
+from AppKit import (
+    NSApplication, NSBackingStoreBuffered, NSButton, NSRunLoop, NSRunLoopCommonModes,
+    NSTextField, NSTimer, NSWindow, NSWindowStyleMaskClosable, NSWindowStyleMaskTitled
+)
+from Foundation import NSMakeRect, NSObject
+
+from taskpaper.ui.voice_recorder import get_voice_recorder, cleanup_old_recordings, encode_wav
+from taskpaper.core.config import VOICE_UPLOAD_SAMPLE_RATE
 from taskpaper.core.models import VoiceRecording
-from taskpaper.voice.processor import VoiceProcessor
-from taskpaper.voice.storage import VoiceTaskStorage
+from taskpaper.voice.processor import get_voice_processor
+from taskpaper.voice.storage import get_voice_storage
+
+# Shared across windows so back-to-back recordings are processed concurrently
+# without spawning a fresh thread per recording
+_processing_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="voice-proc")
+
+READY_MESSAGE = (
+    "Voice Recording Ready\n\n"
+    "💡 For better task extraction, include:\n"
+    "• WHAT: Describe the task clearly\n"
+    "• WHEN: Mention the date or day\n"
+    "• TIME: Specify if there's a specific time\n"
+    "• DURATION: How long it might take\n\n"
+    "Examples:\n"
+    "\"Call John tomorrow at 2pm about the project\"\n"
+    "\"Review the report on Friday morning for 30 minutes\""
+)
+
+
+class _VoiceWindowController(NSObject):
+    """Objective-C target for the window's buttons, timer and close events."""
+    
+    def initWithOwner_(self, owner):
+        self = objc.super(_VoiceWindowController, self).init()
+        if self is None:
+            return None
+        self.owner = owner
+        return self
+    
+    def primaryClicked_(self, sender):
+        if self.owner is not None:
+            self.owner._on_primary()
+    
+    def secondaryClicked_(self, sender):
+        if self.owner is not None:
+            self.owner._on_secondary()
+    
+    def tick_(self, timer):
+        if self.owner is not None:
+            self.owner._on_tick()
+    
+    def windowWillClose_(self, notification):
+        if self.owner is not None:
+            self.owner._on_window_close()
 
 
-class VoiceWindow(rumps.Window):
-    """Voice recording window using rumps.Window for proper native behavior."""
+class VoiceWindow:
+    """
+    Non-modal voice recording window.
+    
+    One native window stays open for the whole session; button clicks and a
+    0.5s timer update its labels in place instead of reopening modal alerts.
+    """
     
     def __init__(self, on_tasks_added_callback=None):
-        super().__init__(
-            "🎤 Add New Task",
-            "Voice Recording Configuration",
-            dimensions=(450, 200),
-            ok="Close",
-            cancel=None
-        )
-        
-        self.voice_recorder = VoiceRecorder()
+        self.voice_recorder = get_voice_recorder()
         self.recording_timer = None
+        self._live_transcription = None
+        self._status = None
         self.is_recording = False
         self.on_tasks_added_callback = on_tasks_added_callback
         
         # Voice processing components
-        self.voice_processor = VoiceProcessor()
-        self.voice_storage = VoiceTaskStorage()
+        self.voice_processor = get_voice_processor()
+        self.voice_storage = get_voice_storage()
         
-        # Check audio availability
-        if not self.voice_recorder.check_audio_available():
-            self.message = (
-                "❌ Audio Not Available\n\n"
-
-
-            )
-            self.default_text = ""
-        else:
-            self.message = (
-                "Voice Recording Ready\n\n"
-                "💡 For better task extraction, include:\n"
-                "• WHAT: Describe the task clearly\n"
-                "• WHEN: Mention the date or day\n"
-                "• TIME: Specify if there's a specific time\n"
-                "• DURATION: How long it might take\n\n"
-                "Examples:\n"
-                "\"Call John tomorrow at 2pm about the project\"\n"
-                "\"Review the report on Friday morning for 30 minutes\"\n\n"
-            )
-            self.default_text = "Click 'Start Recording' to begin..."
+        self._controller = _VoiceWindowController.alloc().initWithOwner_(self)
+        self._window = None
+        self._message_label = None
+        self._primary_button = None
+        self._secondary_button = None
     
     def run(self):
-        """Show the window and handle the recording interface."""
+        """Show the window; returns immediately, the window stays up until closed."""
         if not self.voice_recorder.check_audio_available():
-            # Show error and close
-            response = super().run()
-            return response
+            rumps.alert(
+                "❌ Audio Not Available",
+                "Voice recording requires the sounddevice and numpy packages and a microphone."
+            )
+            return
         
-        # Show main interface
-        return self._show_recording_interface()
+        if self._window is None:
+            self._build_window()
+        self._render()
+        self._window.center()
+        self.bring_to_front()
     
-    def _show_recording_interface(self):
-        """Show the interactive recording interface."""
-        while True:
-            try:
-                # Update status based on recording state
-                if self.is_recording:
-                    duration = self.voice_recorder.get_recording_duration()
-                    self.title = "🔴 Recording in Progress..."
-                    self.message = (
-                        f"Recording: {duration:.1f}s\n\n"
-                        "Click 'Stop Recording' to save, or 'Cancel Recording' to discard.\n\n"
-                    )
-                    # Buttons: [OK=1, Other=0, Cancel=None/2]
-                    buttons = ["Stop Recording", "Cancel Recording", "Close"]
-                else:
-                    self.title = "🎤 Add New Task"
-                    self.message = (
-                        "Voice Recording Ready\n\n"
-                        "💡 For better task extraction, include:\n"
-                        "• WHAT: Describe the task clearly\n"
-                        "• WHEN: Mention the date or day\n"
-                        "• TIME: Specify if there's a specific time\n"
-                        "• DURATION: How long it might take\n\n"
-                        "Examples:\n"
-                        "\"Call John tomorrow at 2pm about the project\"\n"
-                        "\"Review the report on Friday morning for 30 minutes\"\n\n"
-                    )
-                    # Buttons: [OK=1, Cancel=None/2]
-                    buttons = ["🎤 Start Recording", "Close"]
-                
-                # Show dialog with current state
-                response = rumps.alert(
-                    self.title,
-                    self.message,
-                    ok=buttons[0],
-                    cancel=buttons[1]
-                )
-                
-                # Handle response
-                if response == 1:  # OK button (Start Recording)
-                    if self.is_recording:
-                        self._stop_recording()
-                    else:
-                        self._start_recording()
-                else:  # Cancel button (Close)
-                    if self.is_recording:
-                        self._cancel_recording()
-                    break  # Close the window
-                    
-            except Exception as e:
-                rumps.alert("Error", f"Recording interface error: {e}")
-                break
+    def bring_to_front(self):
+        """Focus the window (menubar apps must activate themselves first)."""
+        NSApplication.sharedApplication().activateIgnoringOtherApps_(True)
+        self._window.makeKeyAndOrderFront_(None)
+    
+    def _build_window(self):
+        """Create the window, message label and the two buttons."""
+        window = NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
+            NSMakeRect(0, 0, 450, 260),
+            NSWindowStyleMaskTitled | NSWindowStyleMaskClosable,
+            NSBackingStoreBuffered,
+            False
+        )
+        window.setReleasedWhenClosed_(False)
+        window.setDelegate_(self._controller)
+        content = window.contentView()
+        
+        label = NSTextField.wrappingLabelWithString_("")
+        label.setFrame_(NSMakeRect(20, 60, 410, 180))
+        content.addSubview_(label)
+        
+        primary = NSButton.buttonWithTitle_target_action_("", self._controller, "primaryClicked:")
+        primary.setFrame_(NSMakeRect(290, 14, 145, 32))
+        primary.setKeyEquivalent_("\r")
+        content.addSubview_(primary)
+        
+        secondary = NSButton.buttonWithTitle_target_action_("", self._controller, "secondaryClicked:")
+        secondary.setFrame_(NSMakeRect(140, 14, 145, 32))
+        content.addSubview_(secondary)
+        
+        self._window = window
+        self._message_label = label
+        self._primary_button = primary
+        self._secondary_button = secondary
+    
+    def _render(self):
+        """Update the window title, message and button labels for the current state."""
+        if self.is_recording:
+            self._window.setTitle_("🔴 Recording in Progress...")
+            self._message_label.setStringValue_(self._recording_message())
+            self._primary_button.setTitle_("Stop Recording")
+            self._secondary_button.setTitle_("Cancel Recording")
+        else:
+            self._window.setTitle_("🎤 Add New Task")
+            message = f"{self._status}\n\n{READY_MESSAGE}" if self._status else READY_MESSAGE
+            self._message_label.setStringValue_(message)
+            self._primary_button.setTitle_("🎤 Start Recording")
+            self._secondary_button.setTitle_("Close")
+    
+    def _recording_message(self) -> str:
+        """Build the status message shown while recording."""
+        duration = self.voice_recorder.get_recording_duration()
+        return (
+            f"Recording: {duration:.1f}s\n\n"
+            "Click 'Stop Recording' to save, or 'Cancel Recording' to discard."
+        )
+    
+    def _on_primary(self):
+        """Start or stop recording, keeping the window open."""
+        if self.is_recording:
+            self._stop_recording()
+        else:
+            self._start_recording()
+        self._render()
+    
+    def _on_secondary(self):
+        """Cancel the recording (if any) and close the window."""
+        self._window.close()
+    
+    def _on_tick(self):
+        """Timer callback - refresh the duration in place."""
+        if self.is_recording:
+            self._message_label.setStringValue_(self._recording_message())
+    
+    def _on_window_close(self):
+        """Window closing (button or title bar) - discard any recording in progress."""
+        if self.is_recording:
+            self._cancel_recording()
+        self._stop_timer()
+        global _open_window
+        if _open_window is self:
+            _open_window = None
         
-        return response
+        # The controller is an ObjC object, so the GC can't break the
+        # owner <-> controller cycle; do it here so the window can be freed
+        self._window.setDelegate_(None)
+        self._controller.owner = None
     
     def _start_recording(self):
         """Start voice recording."""
         try:
-            if self.voice_recorder.start_recording():
+            # Transcribe in chunks while recording so the text is mostly ready on stop
+            live = self.voice_processor.start_live_transcription()
+            # Chunks are uploaded at Whisper's native rate like the saved file
+            on_chunk = (
+                lambda frames: live.add_audio(encode_wav(frames, VOICE_UPLOAD_SAMPLE_RATE))
+            ) if live else None
+            
+            if self.voice_recorder.start_recording(on_chunk=on_chunk):
                 self.is_recording = True
+                self._live_transcription = live
+                self._status = None
                 rumps.notification("TaskPaper", "Recording Started", "Voice recording in progress...")
                 
                 # Start timer for duration updates
@@ -141,6 +221,7 @@ class VoiceWindow(rumps.Window):
             self._stop_timer()
             
             recording = self.voice_recorder.stop_recording()
+            live, self._live_transcription = self._live_transcription, None
             if recording:
                 # Clean up old recordings
                 cleanup_old_recordings()
@@ -149,17 +230,13 @@ class VoiceWindow(rumps.Window):
                 rumps.notification("TaskPaper", "Recording Saved", f"Voice memo saved ({duration_str})")
                 
                 # Start background processing
-                self._process_recording_async(recording)
+                self._process_recording_async(recording, live)
                 
-                # Show success message
-                rumps.alert(
-                    "Recording Saved! ✅",
-                    f"Voice memo saved successfully!\n\n"
-                    f"Duration: {duration_str}\n"
-                    f"Processing for tasks in background...",
-                    ok="OK"
-                )
+                # Report success in the window rather than a modal alert
+                self._status = f"Recording Saved! ✅ ({duration_str}) Processing for tasks in background..."
             else:
+                if live:
+                    live.cancel()
                 rumps.alert("Recording Failed", "Could not save voice recording.")
             
             self.is_recording = False
@@ -173,6 +250,10 @@ class VoiceWindow(rumps.Window):
         try:
             self._stop_timer()
             
+            if self._live_transcription:
+                self._live_transcription.cancel()
+                self._live_transcription = None
+            
             if self.voice_recorder.cancel_recording():
                 rumps.notification("TaskPaper", "Recording Cancelled", "Voice recording cancelled")
             
@@ -184,71 +265,109 @@ class VoiceWindow(rumps.Window):
     
     def _start_timer(self):
         """Start timer to update recording duration."""
-        if self.recording_timer:
-            self.recording_timer.stop()
+        self._stop_timer()
         
-        # Create timer that fires every 0.5 seconds for smoother updates
-        self.recording_timer = rumps.Timer(self._timer_callback, 0.5)
-        self.recording_timer.start()
+        # Create timer that fires every 0.5 seconds for smoother updates.
+        # Common modes keep it firing while a menu or window drag is tracking.
+        self.recording_timer = NSTimer.timerWithTimeInterval_target_selector_userInfo_repeats_(
+            0.5, self._controller, "tick:", None, True
+        )
+        NSRunLoop.currentRunLoop().addTimer_forMode_(self.recording_timer, NSRunLoopCommonModes)
     
     def _stop_timer(self):
         """Stop recording update timer."""
         if self.recording_timer:
-            self.recording_timer.stop()
+            self.recording_timer.invalidate()
             self.recording_timer = None
     
-    def _timer_callback(self, _):
-        """Timer callback - just keeps timer running, actual update happens in main loop."""
-        pass
-    
-    def _process_recording_async(self, recording: VoiceRecording):
+    def _process_recording_async(self, recording: VoiceRecording, live_transcription=None):
         """Process recording in background thread to extract tasks."""
         def process():
+            # Save each task as soon as it is streamed back rather than after the whole reply
+            streamed = []
+            
+            def save_task(task):
+                # Only the first task replaces earlier results for this recording
+                if self.voice_storage.append_tasks([task], replace_recording=not streamed):
+                    streamed.append(task)
+            
+            tasks = None
             try:
-                # Process the recording to extract tasks
-                tasks = self.voice_processor.process_recording(recording.path, recording.id)
+                # Use the text transcribed while recording; None falls back to the saved file
+                transcription = live_transcription.result() if live_transcription else None
                 
-                if tasks:
-                    # Save tasks to storage
-                    success = self.voice_storage.add_tasks_from_recording(tasks, self.on_tasks_added_callback)
-                    
-                    if success:
-                        task_count = len(tasks)
-                        today_tasks = [t for t in tasks if t.is_today]
-                        today_count = len(today_tasks)
-                        
-                        # Show notification about extracted tasks
-                        if today_count > 0:
-                            rumps.notification(
-                                "TaskPaper", 
-                                "Tasks Extracted! 📝", 
-                                f"Found {task_count} task(s), {today_count} for today"
-                            )
-                        else:
-                            rumps.notification(
-                                "TaskPaper", 
-                                "Tasks Extracted! 📝", 
-                                f"Found {task_count} task(s) for future dates"
-                            )
+                # Process the recording to extract tasks
+                tasks = self.voice_processor.process_recording(
+                    recording.path, recording.id, transcription=transcription, on_task=save_task
+                )
+            except Exception as e:
+                # Don't show error notification to user - just log it. Tasks
+                # streamed before the failure are already saved and still reported.
+                print(f"Error processing recording {recording.id}: {e}")
+            
+            try:
+                # Append anything not streamed (audio-model results)
+                saved = list(streamed)
+                remaining = [t for t in tasks or [] if not any(t is s for s in streamed)]
+                if remaining:
+                    if self.voice_storage.append_tasks(remaining, replace_recording=not streamed):
+                        saved.extend(remaining)
                     else:
                         print("Failed to save extracted tasks")
+                
+                if not saved:
+                    if not tasks:
+                        # No tasks found - likely not task-related content
+                        print(f"No tasks extracted from recording {recording.id} - not task-related content")
+                    return
+                
+                task_count = len(saved)
+                today_count = sum(1 for t in saved if t.is_today)
+                
+                # Show notification about extracted tasks
+                if today_count > 0:
+                    rumps.notification(
+                        "TaskPaper", 
+                        "Tasks Extracted! 📝", 
+                        f"Found {task_count} task(s), {today_count} for today"
+                    )
                 else:
-                    # No tasks found - likely not task-related content
-                    print(f"No tasks extracted from recording {recording.id} - not task-related content")
-                    
+                    rumps.notification(
+                        "TaskPaper", 
+                        "Tasks Extracted! 📝", 
+                        f"Found {task_count} task(s) for future dates"
+                    )
+                
+                if self.on_tasks_added_callback:
+                    try:
+                        self.on_tasks_added_callback(saved)
+                    except Exception as e:
+                        print(f"Error in on_tasks_added_callback: {e}")
+                
+                # Compaction runs after the user is notified
+                self.voice_storage.compact_if_needed()
+                
             except Exception as e:
-                print(f"Error processing recording {recording.id}: {e}")
-                # Don't show error notification to user - just log it
+                print(f"Error saving tasks from recording {recording.id}: {e}")
         
-        # Start processing in background thread
-        processing_thread = threading.Thread(target=process, daemon=True)
-        processing_thread.start()
+        # Hand processing to the shared worker pool
+        _processing_executor.submit(process)
+
+
+# The window currently on screen, so the menu item focuses it instead of opening another
+_open_window: Optional[VoiceWindow] = None
 
 
 def show_voice_window(on_tasks_added_callback=None):
-    """Show the voice recording window."""
+    """Show the voice recording window, or bring the open one to the front."""
+    global _open_window
     try:
+        if _open_window is not None:
+            _open_window.bring_to_front()
+            return
         window = VoiceWindow(on_tasks_added_callback=on_tasks_added_callback)
         window.run()
+        if window._window is not None:
+            _open_window = window
     except Exception as e:
         rumps.alert("Error", f"Failed to open voice recording: {e}")
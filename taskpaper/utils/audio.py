@@ -0,0 +1,14 @@
+"""
+Audio helpers shared by the recorder and the voice processor.
+"""
+from typing import Any
+
+import numpy as np
+
+
+def resample_mono(audio_data: Any, from_rate: int, to_rate: int) -> Any:
+    """Mix float32 frames down to mono and linearly resample from from_rate to to_rate."""
+    mono = audio_data.mean(axis=1, dtype=np.float32) if audio_data.ndim > 1 else audio_data
+    out_len = len(mono) * to_rate // from_rate
+    positions = np.arange(out_len, dtype=np.float64) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(mono)), mono).astype(np.float32)
@@ -0,0 +1,44 @@
+"""
+Incremental JSON helpers for streamed model replies.
+"""
+from typing import Iterable, Iterator, List, Optional
+
+
+def iter_array_items(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the raw JSON text of each object in the first array of a streamed document.
+    
+    Tracks string/escape state and nesting depth so it can run on partial
+    input; stops at the end of that array.
+    """
+    depth = 0
+    array_depth = None
+    in_string = escaped = False
+    item: Optional[List[str]] = None
+    
+    for chunk in chunks:
+        for ch in chunk:
+            if item is not None:
+                item.append(ch)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "[" or ch == "{":
+                depth += 1
+                if ch == "[" and array_depth is None:
+                    array_depth = depth
+                elif ch == "{" and item is None and array_depth is not None and depth == array_depth + 1:
+                    item = ["{"]
+            elif ch == "]" or ch == "}":
+                depth -= 1
+                if item is not None and depth == array_depth:
+                    yield "".join(item)
+                    item = None
+                elif array_depth is not None and depth < array_depth:
+                    return
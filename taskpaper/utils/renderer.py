@@ -2,17 +2,19 @@
 Wallpaper rendering functionality for TaskPaper.
 """
 import os
-import datetime as dt
-from typing import List, Tuple
+import functools
+from typing import List, Optional, Tuple
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 
-from taskpaper.core.config import TZ, MAX_CARD_WIDTH, MAX_CARD_HEIGHT
+from taskpaper.core.config import MAX_CARD_WIDTH, MAX_CARD_HEIGHT
 from taskpaper.core.models import CalItem, UrgentTask, DisplayItem
 
 
+@functools.lru_cache(maxsize=16)
 def load_font(size: int) -> ImageFont.FreeTypeFont:
-    """Load system font with fallbacks."""
+    """Load system font with fallbacks (cached per size)."""
     candidates = [
         "/System/Library/Fonts/SFNS.ttf",
         "/System/Library/Fonts/SFNSDisplay.ttf",
@@ -29,33 +31,49 @@ def load_font(size: int) -> ImageFont.FreeTypeFont:
     return ImageFont.load_default()
 
 
-def draw_vertical_gradient(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int]) -> Image:
-    """Create vertical gradient background."""
-    W, H = size
-    base = Image.new("RGB", (W, H), bottom)
-    top_img = Image.new("RGB", (W, H), top)
-    mask = Image.linear_gradient("L").resize((W, H))
-    return Image.composite(top_img, base, mask)
+def draw_background(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int],
+                    vignette_strength: int = 180) -> Image:
+    """
+    Create the gradient + vignette background.
+    
+    The gradient runs from `bottom` at the top edge to `top` at the bottom
+    edge, and the vignette darkens towards the center with
+    alpha = strength * (1 - r / max_r). The background only depends on the
+    arguments, so it is rendered once and copied for each wallpaper.
+    """
+    return _render_background(tuple(size), tuple(top), tuple(bottom), vignette_strength).copy()
 
 
-def apply_vignette(img: Image, strength: int = 180) -> Image:
-    """Apply vignette effect to image."""
-    W, H = img.size
-    vignette = Image.new("L", (W, H), 0)
-    d = ImageDraw.Draw(vignette)
+@functools.lru_cache(maxsize=2)
+def _render_background(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int],
+                       vignette_strength: int) -> Image:
+    """Render the background in a single NumPy pass (cached; callers must copy)."""
+    W, H = size
     cx, cy = W // 2, H // 2
-    max_r = int((W**2 + H**2) ** 0.5 // 2)
+    max_r = max(1, int((W**2 + H**2) ** 0.5 // 2))
+    
+    # Per-pixel brightness factor left after the black vignette overlay
+    xs = np.arange(W, dtype=np.float32) - cx
+    ys = np.arange(H, dtype=np.float32)[:, None] - cy
+    scale = np.add(xs * xs, ys * ys)
+    np.sqrt(scale, out=scale)
+    scale *= -vignette_strength / max_r
+    scale += vignette_strength
+    np.clip(scale, 0, 255, out=scale)
+    scale *= -1 / 255
+    scale += 1
     
-    for r in range(max_r, 0, -max(1, max_r // 40)):
-        alpha = int((1 - r / max_r) * strength)
-        d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=alpha)
+    # Per-row gradient color, shape (H, 3)
+    t = np.linspace(0.0, 1.0, H, dtype=np.float32)[:, None]
+    rows = np.asarray(bottom, np.float32) + (np.asarray(top, np.float32) - np.asarray(bottom, np.float32)) * t
     
-    vignette = vignette.filter(ImageFilter.GaussianBlur(radius=max(10, min(W, H) // 60)))
-    overlay = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-    overlay.putalpha(vignette)
-    out = img.convert("RGBA")
-    out.alpha_composite(overlay)
-    return out
+    out = np.empty((H, W, 3), np.uint8)
+    channel = np.empty((H, W), np.float32)
+    for c in range(3):
+        np.multiply(scale, rows[:, c:c + 1], out=channel)
+        channel += 0.5
+        out[..., c] = channel
+    return Image.fromarray(out, "RGB")
 
 
 def wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
@@ -63,15 +81,21 @@ def wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont
     words = text.split()
     lines: List[str] = []
     current = []
+    current_w = 0.0
     
+    # Measure each word once and pack greedily on running widths
+    space_w = draw.textlength(" ", font=font)
     for word in words:
-        test = (" ".join(current + [word])).strip()
-        if draw.textlength(test, font=font) <= max_width:
+        word_w = draw.textlength(word, font=font)
+        test_w = current_w + space_w + word_w if current else word_w
+        if test_w <= max_width:
             current.append(word)
+            current_w = test_w
         else:
             if current:
                 lines.append(" ".join(current))
             current = [word]
+            current_w = word_w
     
     if current:
         lines.append(" ".join(current))
@@ -122,10 +146,8 @@ def prepare_display_items(tasks: List[UrgentTask], events: List[CalItem]) -> Lis
     else:
         # Fallback: show raw calendar events if no processed tasks
         for event in events[:6]:
-            start = event.start.strftime("%H:%M") if event.start else "--"
-            end = event.end.strftime("%H:%M") if event.end else "--"
             display_items.append(DisplayItem(
-                text=f"{start}–{end}  {event.summary}",
+                text=f"{event.start_hm}–{event.end_hm}  {event.summary}",
                 source='calendar',
                 priority=3,
                 type='event'
@@ -134,7 +156,8 @@ def prepare_display_items(tasks: List[UrgentTask], events: List[CalItem]) -> Lis
     return display_items
 
 
-def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple[int, int], out_path: str):
+def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple[int, int], out_path: str,
+                     display_items: Optional[List[DisplayItem]] = None):
     """
     Render wallpaper with tasks and events.
     
@@ -143,13 +166,12 @@ def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple
         events: Calendar events for fallback
         size: Wallpaper dimensions (width, height)
         out_path: Output file path
+        display_items: Precomputed prepare_display_items(tasks, events), if available
     """
     W, H = size
     
     # Create background
-    bg = draw_vertical_gradient((W, H), (34, 40, 55), (14, 18, 26))
-    img = bg.convert("RGBA")
-    img = apply_vignette(img, strength=160)
+    img = draw_background((W, H), (34, 40, 55), (14, 18, 26), vignette_strength=160)
     
     d = ImageDraw.Draw(img)
     
@@ -158,16 +180,10 @@ def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple
     base = max(16, min(28, int(min(W, H) / 70)))
     
     # Fonts
-    title_font = load_font(base * 3)
     h1 = load_font(int(base * 2.2))
     h2 = load_font(int(base * 1.6))
     small = load_font(int(base * 1.2))
     
-    # Header today's date
-    # now = dt.datetime.now(TZ)
-    # header = f"{now:%A, %b %d}"
-    # draw_text_with_shadow(d, (margin, margin), header, title_font, (255, 255, 255, 255), 3)
-    
     # Card layout with size constraints
     available_width = W - 2 * margin
     card_width = min(MAX_CARD_WIDTH, available_width)
@@ -177,7 +193,8 @@ def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple
     card_pad = int(base * 1.5)
     
     # Prepare items to display
-    display_items = prepare_display_items(tasks, events)
+    if display_items is None:
+        display_items = prepare_display_items(tasks, events)
     
     # Calculate card height
     total_items = len(display_items) if display_items else 1
@@ -211,8 +228,18 @@ def render_wallpaper(tasks: List[UrgentTask], events: List[CalItem], size: Tuple
         draw_text_with_shadow(d, (list_left, y), message, h2, color, 1)
     
     # Save wallpaper
-    img = img.convert("RGB")
-    img.save(out_path, "PNG", optimize=True)
+    # Fast zlib level: the file is read once by the WindowServer, size barely matters
+    img.save(out_path, "PNG", compress_level=1)
+
+
+# Item styling (icon, icon color) by source, and priority dot colors
+_VOICE_ICON = ("🎤", (255, 150, 100, 255))     # Orange for voice
+_CALENDAR_ICON = ("🕐", (100, 150, 255, 255))  # Blue for calendar
+_PRIORITY_COLORS = {
+    1: (100, 200, 100), 2: (150, 200, 100), 3: (200, 200, 100), 
+    4: (255, 180, 100), 5: (255, 120, 120)
+}
+_DEFAULT_PRIORITY_COLOR = (100, 150, 255)
 
 
 def _render_items(draw: ImageDraw.ImageDraw, items: List[DisplayItem], list_left: int, 
@@ -220,21 +247,13 @@ def _render_items(draw: ImageDraw.ImageDraw, items: List[DisplayItem], list_left
                  small_font: ImageFont.FreeTypeFont, line_height: int):
     """Render display items on the wallpaper."""
     y = start_y
+    dot_offset = int(h2_font.size * 0.3)
+    item_gap = int(h2_font.size * 0.2)
     
     for item in items:
         # Choose icon and colors based on source
-        if item.source == 'voice':
-            icon = "🎤"
-            icon_color = (255, 150, 100, 255)  # Orange for voice
-        else:
-            icon = "🕐"
-            icon_color = (100, 150, 255, 255)  # Blue for calendar
-        
-        priority_colors = {
-            1: (100, 200, 100), 2: (150, 200, 100), 3: (200, 200, 100), 
-            4: (255, 180, 100), 5: (255, 120, 120)
-        }
-        priority_color = priority_colors.get(item.priority, (100, 150, 255))
+        icon, icon_color = _VOICE_ICON if item.source == 'voice' else _CALENDAR_ICON
+        priority_color = _PRIORITY_COLORS.get(item.priority, _DEFAULT_PRIORITY_COLOR)
         
         # Draw source icon
         draw_text_with_shadow(draw, (list_left - 32, y), icon, small_font, icon_color, 1)
@@ -242,7 +261,7 @@ def _render_items(draw: ImageDraw.ImageDraw, items: List[DisplayItem], list_left
         # Draw priority dot for tasks
         if item.type == 'task':
             dot_x = list_left - 12
-            dot_y = y + int(h2_font.size * 0.3)
+            dot_y = y + dot_offset
             draw.ellipse((dot_x - 4, dot_y - 4, dot_x + 4, dot_y + 4), fill=priority_color)
         
         # Format and wrap text
@@ -253,4 +272,4 @@ def _render_items(draw: ImageDraw.ImageDraw, items: List[DisplayItem], list_left
             draw_text_with_shadow(draw, (list_left + indent, y), line, h2_font, (255, 255, 255, 255), 1)
             y += line_height
         
-        y += int(h2_font.size * 0.2)  # Small gap between items
+        y += item_gap  # Small gap between items
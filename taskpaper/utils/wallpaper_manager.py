@@ -1,22 +1,85 @@
 """
 Wallpaper management operations for TaskPaper.
 """
+import hashlib
 import os
-import glob
 import time
 from typing import Tuple
 
-from AppKit import NSWorkspace, NSScreen, NSURL
+from AppKit import (
+    NSWorkspace, NSScreen, NSURL,
+    NSNotificationCenter, NSApplicationDidChangeScreenParametersNotification
+)
 
 from taskpaper.core.config import WALL_DIR, WALLPAPER_KEEP_COUNT
 
 
+# Cached screen list and primary size, reset when displays are reconfigured
+_screens_cache = None
+_primary_size_cache = None
+_screen_layout_cache = None
+_screen_observer = None
+
+# Digest and path of the last wallpaper file accepted by wallpaper_changed()
+_last_wallpaper_digest = None
+_last_wallpaper_path = None
+
+
+def _invalidate_screens(_notification=None):
+    """Drop cached screen info after a display configuration change."""
+    global _screens_cache, _primary_size_cache, _screen_layout_cache, _last_wallpaper_digest
+    _screens_cache = None
+    _primary_size_cache = None
+    _screen_layout_cache = None
+    # New displays need the wallpaper set even if the rendered image is unchanged
+    _last_wallpaper_digest = None
+
+
+def _get_screens():
+    """Get NSScreen.screens(), cached until the display configuration changes."""
+    global _screens_cache, _screen_observer
+    if _screen_observer is None:
+        _screen_observer = NSNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+            NSApplicationDidChangeScreenParametersNotification, None, None, _invalidate_screens
+        )
+    if _screens_cache is None:
+        _screens_cache = NSScreen.screens()
+    return _screens_cache
+
+
+def wallpaper_changed(path: str) -> bool:
+    """
+    Check a freshly rendered wallpaper against the one currently set.
+    
+    Returns False (and deletes the new file) when the image is byte-for-byte
+    identical, so callers can skip the per-screen WindowServer reload.
+    """
+    global _last_wallpaper_digest, _last_wallpaper_path
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return True
+    
+    if digest == _last_wallpaper_digest:
+        # Filenames have 1s resolution, so the new file may be the one on screen
+        if path != _last_wallpaper_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return False
+    
+    _last_wallpaper_digest = digest
+    _last_wallpaper_path = path
+    return True
+
+
 def set_wallpaper_all_displays(path: str):
     """Set wallpaper on all displays."""
     ws = NSWorkspace.sharedWorkspace()
-    screens = NSScreen.screens()
-    for screen in screens:
-        url = NSURL.fileURLWithPath_(path)
+    url = NSURL.fileURLWithPath_(path)
+    for screen in _get_screens():
         # options and error can be None in PyObjC call
         ws.setDesktopImageURL_forScreen_options_error_(url, screen, None, None)
 
@@ -30,12 +93,18 @@ def cleanup_old_wallpapers(current_file: str, keep_count: int = WALLPAPER_KEEP_C
         keep_count: Number of most recent wallpapers to keep
     """
     try:
-        # Get all wallpaper files
-        pattern = os.path.join(WALL_DIR, "wall-*.png")
-        all_files = glob.glob(pattern)
+        # Get all wallpaper files; DirEntry caches the stat result
+        with os.scandir(WALL_DIR) as it:
+            entries = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.name.startswith("wall-") and entry.name.endswith(".png")
+                and entry.is_file(follow_symlinks=False)
+            ]
         
         # Sort by modification time (newest first)
-        all_files.sort(key=os.path.getmtime, reverse=True)
+        entries.sort(reverse=True)
+        all_files = [path for _, path in entries]
         
         # Always keep the current file at the top
         if current_file in all_files:
@@ -55,13 +124,29 @@ def cleanup_old_wallpapers(current_file: str, keep_count: int = WALLPAPER_KEEP_C
 
 
 def get_primary_screen_size() -> Tuple[int, int]:
-    """Get the size of the primary screen."""
-    screens = NSScreen.screens()
+    """Get the size of the primary screen (cached until displays change)."""
+    global _primary_size_cache
+    if _primary_size_cache is not None:
+        return _primary_size_cache
+    
+    screens = _get_screens()
     if not screens:
         return (1920, 1080)  # Default fallback
     
     frame = screens[0].frame()
-    return int(frame.size.width), int(frame.size.height)
+    _primary_size_cache = (int(frame.size.width), int(frame.size.height))
+    return _primary_size_cache
+
+
+def get_screen_layout() -> Tuple[Tuple[float, float, float, float], ...]:
+    """Frames of all screens (cached until displays change); differs whenever a display is added or moved."""
+    global _screen_layout_cache
+    if _screen_layout_cache is None:
+        _screen_layout_cache = tuple(
+            (frame.origin.x, frame.origin.y, frame.size.width, frame.size.height)
+            for frame in (screen.frame() for screen in _get_screens())
+        )
+    return _screen_layout_cache
 
 
 def generate_wallpaper_filename() -> str:
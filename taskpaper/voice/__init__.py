@@ -4,8 +4,11 @@ Voice processing module for TaskPaper.
 This module handles voice recording transcription and task extraction.
 """
 
-from .processor import VoiceProcessor
-from .storage import VoiceTaskStorage
+from .processor import VoiceProcessor, get_voice_processor
+from .storage import VoiceTaskStorage, get_voice_storage
 from .models import VoiceTaskExtended
 
-__all__ = ['VoiceProcessor', 'VoiceTaskStorage', 'VoiceTaskExtended']
+__all__ = [
+    'VoiceProcessor', 'VoiceTaskStorage', 'VoiceTaskExtended',
+    'get_voice_processor', 'get_voice_storage'
+]
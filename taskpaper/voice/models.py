@@ -2,11 +2,28 @@
 Extended models for voice task processing.
 """
 import datetime as dt
-from dataclasses import dataclass
+import functools
+import time
+from dataclasses import dataclass, field, fields
 from typing import Optional
 
+from taskpaper.core.models import UrgentTask, parse_time_minutes
 
-@dataclass
+
+_DEFAULT_DURATION = dt.timedelta(minutes=30)
+
+
+@functools.lru_cache(maxsize=1)
+def _today_for_minute(_minute: int) -> dt.date:
+    return dt.date.today()
+
+
+def _today() -> dt.date:
+    """Today's date, recomputed at most once a minute."""
+    return _today_for_minute(int(time.time() // 60))
+
+
+@dataclass(slots=True)
 class VoiceTaskExtended:
     """Extended voice task with additional fields extracted from voice."""
     title: str
@@ -18,62 +35,87 @@ class VoiceTaskExtended:
     emoji: Optional[str] = None       # Emoji icon for the task
     recording_id: str = ""            # ID of the source recording
     source: str = "voice"             # Always "voice" for voice tasks
+    date_obj: Optional[dt.date] = field(default=None, init=False, repr=False, compare=False)
+    end_min: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    # Memoized display forms; tasks aren't edited after extraction, so these never go stale
+    _display_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _urgent_task: Optional[UrgentTask] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Parse once so the filter properties don't re-run strptime per call
+        try:
+            self.date_obj = dt.date.fromisoformat(self.date) if self.date else None
+        except (ValueError, TypeError):
+            self.date_obj = None
+        try:
+            self.end_min = parse_time_minutes(self.end_time)
+        except (TypeError, AttributeError):
+            self.end_min = None
+    
+    def to_dict(self) -> dict:
+        """Serialize the persisted (init) fields."""
+        return {name: getattr(self, name) for name in _PERSISTED_FIELDS}
+    
+    @classmethod
+    def from_dict(cls, task_data: dict) -> "VoiceTaskExtended":
+        """Build a task from to_dict() output, ignoring unknown keys."""
+        kwargs = {name: task_data[name] for name in _PERSISTED_FIELDS if name in task_data}
+        kwargs.setdefault('title', '')
+        return cls(**kwargs)
+    
+    @classmethod
+    def from_api(cls, task_data: dict, recording_id: str, today: str) -> "VoiceTaskExtended":
+        """Build a task from one object of the model's "tasks" array."""
+        get = task_data.get
+        start_time = get('start_time')
+        end_time = get('end_time')
+        
+        # No end time but a start time: default to a 30 minute slot
+        if not end_time and start_time:
+            try:
+                # strptime's placeholder date is fine, only the clock time is kept
+                end_at = dt.datetime.strptime(start_time, '%I:%M %p') + _DEFAULT_DURATION
+                end_time = end_at.strftime('%I:%M %p').lstrip('0')  # Remove leading zero from hour
+            except (ValueError, TypeError):
+                pass
+        
+        priority = get('priority')
+        if not isinstance(priority, int):
+            priority = int(priority) if priority else 3
+        
+        return cls(
+            title=get('title') or 'Untitled Task',
+            description=get('description'),
+            priority=priority,
+            start_time=start_time,
+            end_time=end_time,
+            date=get('date') or today,
+            emoji=get('emoji'),
+            recording_id=recording_id,
+            source="voice"
+        )
     
     @property
     def is_today(self) -> bool:
         """Check if this task is for today."""
-        if not self.date:
-            return True  # Assume today if no date specified
-        
-        try:
-            task_date = dt.datetime.strptime(self.date, "%Y-%m-%d").date()
-            today = dt.datetime.now().date()
-            return task_date == today
-        except (ValueError, TypeError):
-            return True  # Assume today if date parsing fails
+        if self.date_obj is None:
+            return True  # Assume today if no date specified or date parsing fails
+        return self.date_obj == _today()
     
     @property
     def is_not_past_due(self) -> bool:
         """Check if this task is not past due (hasn't ended yet)."""
-        # If no end time specified, task is not past due
-        if not self.end_time:
+        # If no end time specified (or it didn't parse), task is not past due
+        if self.end_min is None:
             return True
         
         # If task is not for today, check if the date is in the future
         if not self.is_today:
-            if self.date:
-                try:
-                    task_date = dt.datetime.strptime(self.date, "%Y-%m-%d").date()
-                    today = dt.datetime.now().date()
-                    return task_date > today  # Future dates are not past due
-                except (ValueError, TypeError):
-                    return True
-            return True
+            return self.date_obj > _today()  # Future dates are not past due
         
-        # For today's tasks, check if end time has passed
-        try:
-            now = dt.datetime.now()
-            current_time = now.time()
-            
-            # Parse end_time (could be in "H:MM AM/PM" or "HH:MM" format)
-            end_time_str = self.end_time.strip()
-            
-            # Try parsing with AM/PM format first
-            try:
-                end_time = dt.datetime.strptime(end_time_str, "%I:%M %p").time()
-            except ValueError:
-                # Try 24-hour format
-                try:
-                    end_time = dt.datetime.strptime(end_time_str, "%H:%M").time()
-                except ValueError:
-                    # If parsing fails, assume not past due
-                    return True
-            
-            return current_time <= end_time
-            
-        except (ValueError, TypeError, AttributeError):
-            # If parsing fails, assume not past due
-            return True
+        # For today's tasks, check if end time (HH:MM:00) has passed
+        now = dt.datetime.now()
+        return now.hour * 3600 + now.minute * 60 + now.second <= self.end_min * 60
     
     @property
     def time_range(self) -> Optional[str]:
@@ -86,5 +128,24 @@ class VoiceTaskExtended:
     
     def to_display_format(self) -> str:
         """Convert to display format for wallpaper."""
-        time_part = f"{self.time_range} • " if self.time_range else ""
-        return f"{time_part}{self.title}"
+        if self._display_text is None:
+            time_range = self.time_range
+            time_part = f"{time_range} • " if time_range else ""
+            self._display_text = f"{time_part}{self.title}"
+        return self._display_text
+    
+    def to_urgent_task(self) -> UrgentTask:
+        """Convert to the UrgentTask shown on the wallpaper (built once per task)."""
+        if self._urgent_task is None:
+            self._urgent_task = UrgentTask(
+                title=self.title,
+                source="voice",
+                time=self.start_time,  # Use start_time for display
+                priority=self.priority,
+                link=None  # Voice tasks don't have links
+            )
+        return self._urgent_task
+
+
+# Persisted fields, in declaration order; derived fields like date_obj are init=False
+_PERSISTED_FIELDS = tuple(f.name for f in fields(VoiceTaskExtended) if f.init)
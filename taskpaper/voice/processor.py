@@ -1,40 +1,127 @@
 """
 Voice processing for TaskPaper - OpenAI integration for transcription and task extraction.
 """
+import base64
+import io
 import json
 import datetime as dt
-import os
-import sys
-from typing import Optional, List
+import re
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, List
 
-from taskpaper.core.config import get_openai_api_key, VOICE_SYSTEM_PROMPT
+import numpy as np
+
+from taskpaper.core.config import (
+    get_openai_api_key, VOICE_SYSTEM_PROMPT, VOICE_TASK_KEYWORDS, VOICE_UPLOAD_SAMPLE_RATE
+)
+from taskpaper.utils.audio import resample_mono
+from taskpaper.utils.json_stream import iter_array_items
 
 from .models import VoiceTaskExtended
 
 # OpenAI client - will be initialized when needed
 OPENAI_CLIENT = None
+_client_lock = threading.Lock()
 
-try:
+
+def _build_openai_client(api_key: str):
+    """
+    Create an OpenAI client on a long-lived, pooled HTTP connection.
+    
+    Transcription and extraction calls then reuse the same TLS connection
+    instead of handshaking per request. HTTP/2 is used when the optional
+    h2 package is installed.
+    """
+    import httpx
     from openai import OpenAI
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            http2=http2,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+        )
+    )
+
+
+try:
     api_key = get_openai_api_key()
     if api_key:
-        OPENAI_CLIENT = OpenAI(api_key=api_key)
+        OPENAI_CLIENT = _build_openai_client(api_key)
 except Exception:
     OPENAI_CLIENT = None
 
 
+# Structured-output schema for task extraction; strict mode needs every field
+# listed as required, so optional ones are nullable instead
+_OPTIONAL_STRING = {"type": ["string", "null"]}
+_TIME_STRING = {"type": ["string", "null"], "pattern": "^(1[0-2]|[1-9]):[0-5][0-9] (AM|PM)$"}
+TASKS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "tasks",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {"type": "string"},
+                            "description": _OPTIONAL_STRING,
+                            "priority": {"type": "integer", "enum": [1, 2, 3, 4, 5]},
+                            "start_time": _TIME_STRING,
+                            "end_time": _TIME_STRING,
+                            "date": {"type": "string", "pattern": "^\\d{4}-\\d{2}-\\d{2}$"},
+                            "emoji": _OPTIONAL_STRING
+                        },
+                        "required": ["title", "description", "priority", "start_time", "end_time", "date", "emoji"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["tasks"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Transcribes audio chunks while a recording is still in progress
+_transcription_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="voice-transcribe")
+
+# Cheap pre-filter for transcripts; any digit counts since it's usually a time or date
+_LIKELY_TASK = re.compile(
+    r"\d|\b(?:" + "|".join(re.escape(word) for word in VOICE_TASK_KEYWORDS) + ")",
+    re.IGNORECASE
+) if VOICE_TASK_KEYWORDS else None
+
+
 def reinitialize_openai():
     """Reinitialize OpenAI client with current API key from config."""
     global OPENAI_CLIENT
-    try:
-        from openai import OpenAI
-        api_key = get_openai_api_key()
-        if api_key:
-            OPENAI_CLIENT = OpenAI(api_key=api_key)
-        else:
+    # The old client isn't closed: processing workers or a live transcription
+    # may be mid-request on it. Nothing closes it explicitly either (the SDK
+    # doesn't own a client we pass in); once the last request drops its
+    # reference it is garbage-collected and its pooled sockets close with it.
+    with _client_lock:
+        try:
+            api_key = get_openai_api_key()
+            if api_key:
+                OPENAI_CLIENT = _build_openai_client(api_key)
+            else:
+                OPENAI_CLIENT = None
+        except Exception:
             OPENAI_CLIENT = None
-    except Exception:
-        OPENAI_CLIENT = None
 
 
 class VoiceProcessor:
@@ -44,13 +131,27 @@ class VoiceProcessor:
         if OPENAI_CLIENT is None:
             reinitialize_openai()
     
-    def process_recording(self, audio_file_path: str, recording_id: str) -> Optional[List[VoiceTaskExtended]]:
+    def start_live_transcription(self) -> Optional["LiveTranscription"]:
+        """Begin transcribing a recording chunk by chunk, or None if OpenAI isn't configured."""
+        if not OPENAI_CLIENT:
+            return None
+        return LiveTranscription(self)
+    
+    def process_recording(self, audio_file_path: str, recording_id: str,
+                          transcription: Optional[str] = None,
+                          on_task: Optional[Callable[[VoiceTaskExtended], None]] = None
+                          ) -> Optional[List[VoiceTaskExtended]]:
         """
         Process a voice recording to extract tasks.
         
         Args:
             audio_file_path: Path to the audio file
             recording_id: ID of the recording
+            transcription: Text already transcribed while recording, if any;
+                the file is transcribed when this is None
+            on_task: Called with each task as soon as it is streamed back
+                from text extraction; tasks from the audio model are only
+                returned
             
         Returns:
             List of extracted tasks or None if not task-related
@@ -59,105 +160,282 @@ class VoiceProcessor:
             print("OpenAI client not available")
             return None
         
+        return self._run_pipeline(audio_file_path, recording_id, transcription, on_task)
+    
+    def _run_pipeline(self, audio_file_path: str, recording_id: str, transcription: Optional[str],
+                      on_task: Optional[Callable[[VoiceTaskExtended], None]] = None
+                      ) -> Optional[List[VoiceTaskExtended]]:
+        """Transcribe (unless already done) and extract tasks via the OpenAI API."""
         try:
-            # Step 1: Transcribe audio
-            transcription = self._transcribe_audio(audio_file_path)
+            if transcription is None:
+                wav_bytes = self._read_upload_audio(audio_file_path)
+                
+                # Skip the API entirely for silence / accidental taps
+                if not _has_speech(wav_bytes):
+                    print(f"No speech detected in recording {recording_id}")
+                    return None
+                
+                # Nothing transcribed yet: let an audio-capable model extract tasks
+                # in one round-trip, falling back to Whisper + text extraction
+                try:
+                    return self._extract_tasks_from_audio(wav_bytes, recording_id)
+                except Exception as e:
+                    print(f"Audio task extraction failed, falling back to transcription: {e}")
+                
+                # Step 1: Transcribe audio
+                transcription = self.transcribe_wav_bytes(wav_bytes)
             if not transcription:
                 return None
             
             # Step 2: Extract tasks from transcription
-            tasks = self._extract_tasks_from_text(transcription, recording_id)
+            tasks = self._extract_tasks_from_text(transcription, recording_id, on_task)
             return tasks
             
         except Exception as e:
             print(f"Error processing voice recording: {e}")
             return None
     
-    def _transcribe_audio(self, audio_file_path: str) -> Optional[str]:
-        """Transcribe audio file using OpenAI Whisper."""
+    def _read_upload_audio(self, audio_file_path: str) -> bytes:
+        """Read a saved recording; the recorder already writes it as 16 kHz mono WAV."""
+        with open(audio_file_path, "rb") as audio_file:
+            return audio_file.read()
+    
+    def transcribe_wav_bytes(self, wav_bytes: bytes) -> Optional[str]:
+        """Transcribe in-memory WAV audio using OpenAI Whisper."""
+        return self._request_transcription(("audio.wav", wav_bytes, "audio/wav"))
+    
+    def _request_transcription(self, audio_file) -> Optional[str]:
         try:
-            with open(audio_file_path, "rb") as audio_file:
-                response = OPENAI_CLIENT.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
+            response = OPENAI_CLIENT.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                response_format="text"
+            )
             return response.strip()
             
         except Exception as e:
             print(f"Transcription failed: {e}")
             return None
     
-    def _extract_tasks_from_text(self, text: str, recording_id: str) -> Optional[List[VoiceTaskExtended]]:
-        """Extract structured tasks from transcribed text using GPT."""
+    def _extract_tasks_from_audio(self, wav_bytes: bytes, recording_id: str) -> Optional[List[VoiceTaskExtended]]:
+        """
+        Extract tasks straight from WAV audio with one multimodal chat call.
+        
+        Raises on request or JSON errors so the caller can fall back to the
+        two-step Whisper + text flow.
+        """
+        today = dt.datetime.now().strftime("%Y-%m-%d")
+        response = OPENAI_CLIENT.chat.completions.create(
+            model="gpt-4o-mini-audio-preview",
+            modalities=["text"],
+            messages=[
+                {"role": "system", "content": VOICE_SYSTEM_PROMPT},
+                {"role": "user", "content": [
+                    {
+                        "type": "input_audio",
+                        "input_audio": {
+                            "data": base64.b64encode(wav_bytes).decode("ascii"),
+                            "format": "wav"
+                        }
+                    },
+                    {"type": "text", "text": f"TODAY: {today}\n\nThe voice recording is attached."}
+                ]}
+            ],
+            temperature=0.1,
+            max_tokens=1000
+        )
+        
+        result = (response.choices[0].message.content or "").strip()
+        # Audio models don't support JSON mode; strip a Markdown fence if one comes back
+        if result.startswith("```"):
+            result = result.strip("`").removeprefix("json").strip()
+        if not result:
+            return None
+        return self._parse_tasks_json(result, recording_id, today)
+    
+    def _extract_tasks_from_text(self, text: str, recording_id: str,
+                                 on_task: Optional[Callable[[VoiceTaskExtended], None]] = None
+                                 ) -> Optional[List[VoiceTaskExtended]]:
+        """Extract structured tasks from transcribed text using GPT, streaming each task as it closes."""
+        # Obviously non-task chatter never reaches the API
+        if _LIKELY_TASK is not None and not _LIKELY_TASK.search(text):
+            print(f"No task keywords in recording {recording_id}, skipping extraction")
+            return None
+        
         today = dt.datetime.now().strftime("%Y-%m-%d")
         user_prompt = f"TODAY: {today}\n\nVOICE TRANSCRIPTION:\n{text}"
         
         try:
-            response = OPENAI_CLIENT.chat.completions.create(
+            stream = OPENAI_CLIENT.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": VOICE_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
+                max_tokens=500,
+                response_format=TASKS_RESPONSE_FORMAT,
+                stream=True
             )
+            parts: List[str] = []
             
-            result = response.choices[0].message.content.strip()
+            def deltas() -> Iterator[str]:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield parts[-1]
+            
+            tasks = []
+            try:
+                # Hand each task over as soon as its object closes
+                text_stream = deltas()
+                for raw in iter_array_items(text_stream):
+                    task = VoiceTaskExtended.from_api(json.loads(raw), recording_id, today)
+                    tasks.append(task)
+                    if on_task:
+                        on_task(task)
+                
+                # Read whatever follows the array so the full reply is available below
+                for _ in text_stream:
+                    pass
+            except json.JSONDecodeError as e:
+                print(f"Failed to parse streamed task: {e}")
+            finally:
+                stream.close()
+            
+            if tasks:
+                return tasks
+            
+            result = "".join(parts).strip()
             
             # Handle empty response
             if not result:
                 return None
             
-            # Parse JSON response
+            # Nothing usable came out of the stream; parse the whole reply
             try:
-                data = json.loads(result)
-                if not data or 'tasks' not in data or not data['tasks']:
-                    return None
-                
-                # Convert to VoiceTaskExtended objects
-                tasks = []
-                for task_data in data['tasks']:
-                    start_time = task_data.get('start_time')
-                    end_time = task_data.get('end_time')
-                    
-                    # If end_time is null/not specified but start_time exists, set end_time to start_time + 30 minutes
-                    if not end_time and start_time:
-                        try:
-                            # Parse start_time (format: "H:MM AM/PM")
-                            start_dt = dt.datetime.strptime(start_time, '%I:%M %p')
-                            # Use today's date for calculation
-                            today = dt.datetime.now().replace(hour=start_dt.hour, minute=start_dt.minute, second=0, microsecond=0)
-                            
-                            # Add 30 minutes
-                            end_dt = today + dt.timedelta(minutes=30)
-                            end_time = end_dt.strftime('%I:%M %p').lstrip('0')  # Remove leading zero from hour
-                        except (ValueError, AttributeError):
-                            # If parsing fails, leave end_time as None
-                            pass
-                    
-                    task = VoiceTaskExtended(
-                        title=task_data.get('title', 'Untitled Task'),
-                        description=task_data.get('description'),
-                        priority=int(task_data.get('priority', 3)),
-                        start_time=start_time,
-                        end_time=end_time,
-                        date=task_data.get('date', today),
-                        emoji=task_data.get('emoji'),
-                        recording_id=recording_id,
-                        source="voice"
-                    )
-                    tasks.append(task)
-                
-                return tasks if tasks else None
-                
+                tasks = self._parse_tasks_json(result, recording_id, today)
             except json.JSONDecodeError as e:
                 print(f"Failed to parse JSON response: {e}")
                 print(f"Response was: {result}")
                 return None
+            if tasks and on_task:
+                for task in tasks:
+                    on_task(task)
+            return tasks
                 
         except Exception as e:
             print(f"Task extraction failed: {e}")
             return None
+    
+    def _parse_tasks_json(self, result: str, recording_id: str, today: str) -> Optional[List[VoiceTaskExtended]]:
+        """Convert the model's JSON reply into tasks (raises json.JSONDecodeError on bad JSON)."""
+        data = json.loads(result)
+        if not data or 'tasks' not in data or not data['tasks']:
+            return None
+        
+        # Convert to VoiceTaskExtended objects
+        tasks = [VoiceTaskExtended.from_api(task_data, recording_id, today) for task_data in data['tasks']]
+        return tasks if tasks else None
+
+
+# Below this much detected speech a recording is treated as silence / noise
+MIN_SPEECH_SECONDS = 0.3
+_VAD_FRAME_MS = 30
+_VAD_RATES = (8000, 16000, 32000, 48000)
+
+
+def _has_speech(wav_bytes: bytes) -> bool:
+    """
+    Check for speech with WebRTC VAD before paying for an API round-trip.
+    
+    Audio at other rates or with more channels is resampled to 16 kHz mono
+    in-process first. The gate is skipped (returns True) when webrtcvad isn't
+    installed or the audio isn't 16-bit PCM.
+    """
+    try:
+        import webrtcvad
+    except ImportError:
+        return True
+    
+    try:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+            rate = wav_file.getframerate()
+            channels = wav_file.getnchannels()
+            if wav_file.getsampwidth() != 2:
+                return True
+            pcm = wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError):
+        return True
+    
+    if channels != 1 or rate not in _VAD_RATES:
+        samples = np.frombuffer(pcm, dtype="<i2").reshape(-1, channels).astype(np.float32)
+        pcm = resample_mono(samples, rate, VOICE_UPLOAD_SAMPLE_RATE).astype("<i2").tobytes()
+        rate = VOICE_UPLOAD_SAMPLE_RATE
+    
+    vad = webrtcvad.Vad(2)
+    frame_bytes = rate * _VAD_FRAME_MS // 1000 * 2
+    frames_needed = int(MIN_SPEECH_SECONDS * 1000 / _VAD_FRAME_MS)
+    speech_frames = 0
+    for offset in range(0, len(pcm) - frame_bytes + 1, frame_bytes):
+        if vad.is_speech(pcm[offset:offset + frame_bytes], rate):
+            speech_frames += 1
+            if speech_frames >= frames_needed:
+                return True
+    return False
+
+
+class LiveTranscription:
+    """Transcribes a recording in chunks on background threads while it is still being made."""
+    
+    def __init__(self, processor: VoiceProcessor):
+        self._processor = processor
+        self._futures = []
+    
+    def add_audio(self, wav_bytes: bytes):
+        """Queue the next chunk of the recording (chunks must arrive in order)."""
+        self._futures.append(_transcription_executor.submit(self._transcribe_chunk, wav_bytes))
+    
+    def _transcribe_chunk(self, wav_bytes: bytes) -> Optional[str]:
+        # Silent chunks (pauses, room noise) transcribe to nothing without an upload
+        if not _has_speech(wav_bytes):
+            return ""
+        return self._processor.transcribe_wav_bytes(wav_bytes)
+    
+    def cancel(self):
+        """Drop chunks that haven't been sent yet."""
+        for future in self._futures:
+            future.cancel()
+    
+    def result(self) -> Optional[str]:
+        """
+        Wait for all chunks and join their text in recording order.
+        
+        Returns:
+            The transcription, or None if no chunk was sent or any chunk failed
+            (so the caller falls back to processing the saved file)
+        """
+        if not self._futures:
+            return None
+        
+        texts = []
+        for future in self._futures:
+            text = future.result()
+            if text is None:
+                return None
+            if text:
+                texts.append(text)
+        return " ".join(texts)
+
+
+_voice_processor: Optional[VoiceProcessor] = None
+_voice_processor_lock = threading.Lock()
+
+
+def get_voice_processor() -> VoiceProcessor:
+    """Get the shared VoiceProcessor instance, creating it on first use."""
+    global _voice_processor
+    with _voice_processor_lock:
+        if _voice_processor is None:
+            _voice_processor = VoiceProcessor()
+        return _voice_processor
@@ -3,15 +3,38 @@ Voice task storage management for TaskPaper.
 """
 import json
 import os
+import threading
 import datetime as dt
 from typing import List, Optional
 from pathlib import Path
 
 from .models import VoiceTaskExtended
 
+# Optional fast JSON library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+_loads = orjson.loads if orjson else json.loads
+
 
 class VoiceTaskStorage:
-    """Manages local storage of voice-extracted tasks."""
+    """Manages local storage of voice-extracted tasks.
+
+    Tasks live in an append-only JSONL log (one task per line) written only
+    through ``append_tasks``. Re-processing a recording appends a
+    ``{"deleted_recording_id": ...}`` tombstone before the new tasks;
+    ``compact_if_needed`` and ``cleanup_old_tasks`` rewrite the log. The legacy
+    ``voice_tasks.json`` is only read to migrate older installs.
+    """
     
     def __init__(self, storage_dir: Optional[str] = None):
         if storage_dir:
@@ -22,99 +45,164 @@ class VoiceTaskStorage:
             self.storage_dir = Path(APP_DIR)
         
         self.storage_dir.mkdir(exist_ok=True)
-        self.tasks_file = self.storage_dir / "voice_tasks.json"
+        self.tasks_file = self.storage_dir / "voice_tasks.jsonl"
+        self.legacy_tasks_file = self.storage_dir / "voice_tasks.json"
+        
+        # Parsed tasks, reused until the file's mtime changes
+        self._cache: Optional[List[VoiceTaskExtended]] = None
+        self._cache_mtime: Optional[int] = None
+        # Lines in the log behind the cache; more lines than tasks means it can be compacted
+        self._log_lines = 0
+        # Recordings may be processed concurrently; serialize writes and cache updates
+        self._lock = threading.RLock()
     
-    def load_voice_tasks(self) -> List[VoiceTaskExtended]:
-        """Load all voice tasks from storage."""
+    def _load_legacy_tasks(self) -> List[VoiceTaskExtended]:
+        """Read the old single-document JSON store and migrate it to JSONL."""
+        if not self.legacy_tasks_file.exists():
+            return []
         try:
-            if not self.tasks_file.exists():
-                return []
-            
-            with open(self.tasks_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+            data = _loads(self.legacy_tasks_file.read_bytes())
+            tasks = [VoiceTaskExtended.from_dict(d) for d in data.get('tasks', [])]
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # Set an unreadable store aside so it can't block every later save
+            print(f"Failed to migrate legacy voice tasks: {e}")
+            try:
+                self.legacy_tasks_file.replace(self.legacy_tasks_file.with_suffix('.json.corrupt'))
+            except OSError:
+                pass
             tasks = []
-            for task_data in data.get('tasks', []):
-                task = VoiceTaskExtended(
-                    title=task_data.get('title', ''),
-                    description=task_data.get('description'),
-                    priority=task_data.get('priority', 3),
-                    start_time=task_data.get('start_time'),
-                    end_time=task_data.get('end_time'),
-                    date=task_data.get('date'),
-                    emoji=task_data.get('emoji'),
-                    recording_id=task_data.get('recording_id', ''),
-                    source=task_data.get('source', 'voice')
-                )
-                tasks.append(task)
-            
-            return tasks
-            
+        self.save_voice_tasks(tasks)
+        return tasks
+    
+    def load_voice_tasks(self) -> List[VoiceTaskExtended]:
+        """Load all voice tasks from storage (cached until the file changes)."""
+        try:
+            return self._read_tasks()
         except Exception as e:
             print(f"Failed to load voice tasks: {e}")
             return []
     
-    def save_voice_tasks(self, tasks: List[VoiceTaskExtended]) -> bool:
-        """Save voice tasks to storage."""
-        try:
-            data = {
-                'last_updated': dt.datetime.now().isoformat(),
-                'tasks': []
-            }
-            
-            for task in tasks:
-                task_data = {
-                    'title': task.title,
-                    'description': task.description,
-                    'priority': task.priority,
-                    'start_time': task.start_time,
-                    'end_time': task.end_time,
-                    'date': task.date,
-                    'emoji': task.emoji,
-                    'recording_id': task.recording_id,
-                    'source': task.source
-                }
-                data['tasks'].append(task_data)
+    def _read_tasks(self) -> List[VoiceTaskExtended]:
+        """Like load_voice_tasks(), but raises on failure so rewrites can't mistake it for an empty log."""
+        with self._lock:
+            try:
+                mtime = self.tasks_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                return list(self._load_legacy_tasks())
             
-            with open(self.tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if self._cache is not None and mtime == self._cache_mtime:
+                return list(self._cache)
             
+            tasks = []
+            log_lines = 0
+            with open(self.tasks_file, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    log_lines += 1
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        # Skip a torn trailing line from an interrupted append
+                        continue
+                    deleted_id = entry.get('deleted_recording_id')
+                    if deleted_id is not None:
+                        tasks = [t for t in tasks if t.recording_id != deleted_id]
+                    else:
+                        tasks.append(VoiceTaskExtended.from_dict(entry))
+            
+            self._cache = tasks
+            self._cache_mtime = mtime
+            self._log_lines = log_lines
+            return list(tasks)
+    
+    def save_voice_tasks(self, tasks: List[VoiceTaskExtended]) -> bool:
+        """Rewrite storage with exactly these tasks (compacts the log)."""
+        try:
+            with self._lock:
+                tmp_path = self.tasks_file.with_suffix('.jsonl.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(b''.join(_dumps(task.to_dict()) + b'\n' for task in tasks))
+                os.replace(tmp_path, self.tasks_file)
+            
+                # Keep the cache in sync so the next load doesn't re-parse our own write
+                self._cache = list(tasks)
+                self._cache_mtime = self.tasks_file.stat().st_mtime_ns
+                self._log_lines = len(tasks)
             return True
             
         except Exception as e:
             print(f"Failed to save voice tasks: {e}")
             return False
     
-    def add_tasks_from_recording(self, new_tasks: List[VoiceTaskExtended], on_tasks_added_callback=None) -> bool:
-        """Add new tasks from a recording, merging with existing tasks."""
+    def _cache_is_current(self) -> bool:
         try:
-            # Load existing tasks
-            existing_tasks = self.load_voice_tasks()
-            
-            # Filter out tasks from the same recording (in case of reprocessing)
-            if new_tasks and new_tasks[0].recording_id:
+            return self._cache is not None and self.tasks_file.stat().st_mtime_ns == self._cache_mtime
+        except FileNotFoundError:
+            return False
+    
+    def append_tasks(self, new_tasks: List[VoiceTaskExtended], replace_recording: bool = True) -> bool:
+        """
+        Append tasks from a recording to the log without re-reading it.
+        
+        Earlier tasks from the same recording are tombstoned unless
+        replace_recording is False (used when a recording's tasks are saved one
+        at a time). When the cache is stale the tombstone is written
+        unconditionally rather than parsing the log; compact_if_needed() drops
+        it later.
+        """
+        if not new_tasks:
+            return True
+        try:
+            with self._lock:
+                if not self.tasks_file.exists() and self.legacy_tasks_file.exists():
+                    self._load_legacy_tasks()
+                
+                cache_current = self._cache_is_current()
+                lines = []
+                
+                # Tombstone tasks from the same recording (in case of reprocessing)
                 recording_id = new_tasks[0].recording_id
-                existing_tasks = [t for t in existing_tasks if t.recording_id != recording_id]
-            
-            # Merge tasks
-            all_tasks = existing_tasks + new_tasks
-            
-            # Save merged tasks
-            success = self.save_voice_tasks(all_tasks)
-            
-            # Trigger callback if tasks were successfully added
-            if success and on_tasks_added_callback and new_tasks:
-                try:
-                    on_tasks_added_callback(new_tasks)
-                except Exception as e:
-                    print(f"Error in on_tasks_added_callback: {e}")
-            
-            return success
+                replaces = bool(replace_recording and recording_id) and (
+                    not cache_current or any(t.recording_id == recording_id for t in self._cache)
+                )
+                if replaces:
+                    lines.append(_dumps({'deleted_recording_id': recording_id}))
+                
+                for task in new_tasks:
+                    lines.append(_dumps(task.to_dict()))
+                
+                with open(self.tasks_file, 'ab', buffering=65536) as f:
+                    f.write(b'\n'.join(lines) + b'\n')
+                
+                if cache_current:
+                    # Mirror the log: only a tombstone drops earlier tasks from this recording
+                    if replaces:
+                        self._cache = [t for t in self._cache if t.recording_id != recording_id]
+                    self._cache.extend(new_tasks)
+                    self._cache_mtime = self.tasks_file.stat().st_mtime_ns
+                    self._log_lines += len(lines)
+            return True
             
         except Exception as e:
-            print(f"Failed to add tasks from recording: {e}")
+            print(f"Failed to append voice tasks: {e}")
             return False
     
+    def compact_if_needed(self) -> bool:
+        """Rewrite the log once dead lines (tombstones, replaced tasks) outnumber live tasks."""
+        with self._lock:
+            try:
+                tasks = self._read_tasks()
+            except Exception as e:
+                # Never rewrite the log from a failed read
+                print(f"Skipping voice task compaction: {e}")
+                return False
+            # Waiting for the log to double keeps compaction amortized O(1) per append
+            if self._log_lines - len(tasks) <= len(tasks):
+                return True
+            return self.save_voice_tasks(tasks)
+    
     def get_today_tasks(self) -> List[VoiceTaskExtended]:
         """Get only today's voice tasks that are not past due."""
         all_tasks = self.load_voice_tasks()
@@ -128,25 +216,31 @@ class VoiceTaskStorage:
     def cleanup_old_tasks(self, days_to_keep: int = 30) -> bool:
         """Remove tasks older than specified days."""
         try:
-            all_tasks = self.load_voice_tasks()
-            cutoff_date = dt.datetime.now().date() - dt.timedelta(days=days_to_keep)
-            
-            filtered_tasks = []
-            for task in all_tasks:
-                if task.date:
-                    try:
-                        task_date = dt.datetime.strptime(task.date, "%Y-%m-%d").date()
-                        if task_date >= cutoff_date:
-                            filtered_tasks.append(task)
-                    except (ValueError, TypeError):
-                        # Keep tasks with invalid dates
+            with self._lock:
+                all_tasks = self._read_tasks()
+                cutoff_date = dt.datetime.now().date() - dt.timedelta(days=days_to_keep)
+            
+                filtered_tasks = []
+                for task in all_tasks:
+                    # Keep tasks without dates or with invalid dates
+                    if task.date_obj is None or task.date_obj >= cutoff_date:
                         filtered_tasks.append(task)
-                else:
-                    # Keep tasks without dates
-                    filtered_tasks.append(task)
             
-            return self.save_voice_tasks(filtered_tasks)
+                return self.save_voice_tasks(filtered_tasks)
             
         except Exception as e:
             print(f"Failed to cleanup old tasks: {e}")
             return False
+
+
+_voice_storage: Optional[VoiceTaskStorage] = None
+_voice_storage_lock = threading.Lock()
+
+
+def get_voice_storage() -> VoiceTaskStorage:
+    """Get the shared VoiceTaskStorage instance, creating it on first use."""
+    global _voice_storage
+    with _voice_storage_lock:
+        if _voice_storage is None:
+            _voice_storage = VoiceTaskStorage()
+        return _voice_storage
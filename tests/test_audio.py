@@ -0,0 +1,45 @@
+"""
+Tests for the in-process resampler and the speech gate.
+"""
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from taskpaper.utils.audio import resample_mono
+from taskpaper.voice.processor import _has_speech
+
+
+def _wav(samples, rate, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes((samples * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def _tone(rate, seconds=2.0, freq=300.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_resample_mono_downmixes_and_changes_length():
+    stereo = np.stack([_tone(44100), _tone(44100)], axis=1)
+    out = resample_mono(stereo, 44100, 16000)
+    
+    assert out.ndim == 1 and out.dtype == np.float32
+    assert len(out) == 32000
+    np.testing.assert_allclose(out[:100], _tone(16000)[:100], atol=1e-2)
+
+
+@pytest.mark.parametrize("rate,channels", [(16000, 1), (44100, 1), (44100, 2)])
+def test_speech_gate_runs_at_any_rate(rate, channels):
+    pytest.importorskip("webrtcvad")
+    silence = np.zeros(rate * 2 * channels, dtype=np.float32)
+    voiced = np.repeat(_tone(rate), channels)
+    
+    assert not _has_speech(_wav(silence, rate, channels))
+    assert _has_speech(_wav(voiced, rate, channels))
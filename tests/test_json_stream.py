@@ -0,0 +1,41 @@
+"""
+Tests for the incremental JSON array scanner.
+"""
+import json
+
+from taskpaper.utils.json_stream import iter_array_items
+
+
+def _chunked(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+def test_yields_each_object_of_the_first_array():
+    doc = json.dumps({"tasks": [{"title": "a"}, {"title": "b", "meta": {"x": [1, 2]}}]})
+    
+    for size in (1, 3, len(doc)):
+        items = [json.loads(raw) for raw in iter_array_items(_chunked(doc, size))]
+        assert items == [{"title": "a"}, {"title": "b", "meta": {"x": [1, 2]}}]
+
+
+def test_brackets_and_quotes_inside_strings_are_ignored():
+    doc = json.dumps({"tasks": [{"title": 'Call "Bob" about [x] {y}\\'}, {"title": "next"}]})
+    
+    items = [json.loads(raw) for raw in iter_array_items(_chunked(doc, 2))]
+    assert [item["title"] for item in items] == ['Call "Bob" about [x] {y}\\', "next"]
+
+
+def test_empty_array_yields_nothing():
+    assert list(iter_array_items(['{"tasks": []}'])) == []
+
+
+def test_stops_at_the_end_of_the_first_array():
+    consumed = []
+    
+    def chunks():
+        for chunk in ['{"tasks": [{"a": 1}]', ', "more": [{"b": 2}]}']:
+            consumed.append(chunk)
+            yield chunk
+    
+    assert [json.loads(raw) for raw in iter_array_items(chunks())] == [{"a": 1}]
+    assert len(consumed) == 1
@@ -0,0 +1,49 @@
+"""
+Tests for VoiceTaskExtended parsing.
+"""
+from taskpaper.voice.models import VoiceTaskExtended
+
+
+def test_from_api_defaults_a_thirty_minute_slot():
+    task = VoiceTaskExtended.from_api({"title": "Call", "start_time": "11:45 PM"}, "rec", "2030-01-01")
+    
+    assert task.end_time == "12:15 AM"
+    assert task.end_min == 15
+    assert task.date == "2030-01-01"
+    assert task.recording_id == "rec"
+
+
+def test_from_api_coerces_priority_and_fills_nulls():
+    task = VoiceTaskExtended.from_api(
+        {"title": None, "priority": "2", "start_time": None, "date": None}, "rec", "2030-01-01"
+    )
+    
+    assert task.title == "Untitled Task"
+    assert task.priority == 2
+    assert task.end_time is None
+    assert task.date == "2030-01-01"
+    assert VoiceTaskExtended.from_api({"title": "x", "priority": None}, "rec", "2030-01-01").priority == 3
+
+
+def test_from_api_keeps_explicit_end_time_and_unparseable_start():
+    task = VoiceTaskExtended.from_api(
+        {"title": "Review", "start_time": "9:00 AM", "end_time": "10:30 AM", "priority": 4}, "rec", "2030-01-01"
+    )
+    assert (task.end_time, task.end_min, task.priority) == ("10:30 AM", 630, 4)
+    
+    task = VoiceTaskExtended.from_api({"title": "Odd", "start_time": "soonish"}, "rec", "2030-01-01")
+    assert task.end_time is None and task.end_min is None
+
+
+def test_derived_fields_parse_once_and_tolerate_bad_input():
+    task = VoiceTaskExtended(title="t", date="not-a-date", end_time="25:99")
+    assert task.date_obj is None and task.end_min is None
+    assert task.is_today and task.is_not_past_due
+
+
+def test_dict_round_trip_skips_derived_fields():
+    task = VoiceTaskExtended(title="t", date="2030-01-01", end_time="1:00 PM", recording_id="rec")
+    data = task.to_dict()
+    
+    assert "date_obj" not in data and "end_min" not in data
+    assert VoiceTaskExtended.from_dict({**data, "unknown": 1}) == task
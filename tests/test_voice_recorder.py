@@ -0,0 +1,41 @@
+"""
+Tests for splitting live recording chunks at pauses.
+"""
+import numpy as np
+import pytest
+
+import taskpaper.ui.voice_recorder as voice_recorder
+from taskpaper.ui.voice_recorder import _quietest_split
+
+
+@pytest.fixture(autouse=True)
+def _numpy(monkeypatch):
+    # numpy is only bound when sounddevice imports too
+    monkeypatch.setattr(voice_recorder, "np", np)
+
+
+def _speech_with_gap(rate, seconds, gap_start, gap_len):
+    audio = np.full((int(rate * seconds), 1), 0.4, dtype=np.float32)
+    audio[int(rate * gap_start):int(rate * (gap_start + gap_len))] = 0.0
+    return audio
+
+
+def test_split_lands_inside_the_pause():
+    rate = 1000
+    audio = _speech_with_gap(rate, seconds=10, gap_start=9.0, gap_len=0.1)
+    
+    cut = _quietest_split(audio, search_frames=1500, window_frames=20)
+    assert 9000 <= cut < 9100
+
+
+def test_split_ignores_pauses_before_the_search_window():
+    rate = 1000
+    audio = _speech_with_gap(rate, seconds=10, gap_start=5.0, gap_len=0.5)
+    audio[9500:9520] = 0.1  # quietest spot near the end
+    
+    assert 9500 <= _quietest_split(audio, search_frames=1500, window_frames=20) < 9520
+
+
+def test_short_audio_is_not_split():
+    audio = np.ones((30, 1), dtype=np.float32)
+    assert _quietest_split(audio, search_frames=1500, window_frames=20) == 30
@@ -0,0 +1,109 @@
+"""
+Tests for the JSONL voice task store.
+"""
+from taskpaper.voice.models import VoiceTaskExtended
+from taskpaper.voice.storage import VoiceTaskStorage
+
+
+def _task(title, recording_id="rec-1"):
+    return VoiceTaskExtended(title=title, date="2030-01-01", recording_id=recording_id)
+
+
+def _titles(tasks):
+    return [t.title for t in tasks]
+
+
+def test_streamed_appends_survive_compaction(tmp_path):
+    storage = VoiceTaskStorage(str(tmp_path))
+    storage.append_tasks([_task("old")])
+    storage.load_voice_tasks()  # prime the cache
+    
+    # Tasks streamed one at a time: only the first replaces the recording's earlier results
+    for i, title in enumerate(["t0", "t1", "t2"]):
+        assert storage.append_tasks([_task(title)], replace_recording=(i == 0))
+    
+    assert _titles(storage.load_voice_tasks()) == ["t0", "t1", "t2"]
+    assert storage.compact_if_needed()
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["t0", "t1", "t2"]
+
+
+def test_legacy_json_is_migrated(tmp_path):
+    (tmp_path / "voice_tasks.json").write_text('{"tasks": [{"title": "legacy", "recording_id": "rec-0"}]}')
+    storage = VoiceTaskStorage(str(tmp_path))
+    
+    assert _titles(storage.load_voice_tasks()) == ["legacy"]
+    assert (tmp_path / "voice_tasks.jsonl").exists()
+
+
+def test_corrupt_legacy_json_does_not_block_saves(tmp_path):
+    (tmp_path / "voice_tasks.json").write_text('{"tasks": [{"title": "trunc')
+    storage = VoiceTaskStorage(str(tmp_path))
+    
+    assert storage.append_tasks([_task("new")])
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["new"]
+    assert (tmp_path / "voice_tasks.json.corrupt").exists()
+
+
+def test_compaction_skipped_when_log_unreadable(tmp_path, monkeypatch):
+    storage = VoiceTaskStorage(str(tmp_path))
+    storage.append_tasks([_task("a")])
+    for title in ["b", "c", "d"]:
+        storage.append_tasks([_task(title)])  # each replaces the last, leaving dead lines
+    
+    def fail():
+        raise OSError("disk went away")
+    
+    monkeypatch.setattr(storage, "_read_tasks", fail)
+    assert storage.load_voice_tasks() == []
+    assert not storage.compact_if_needed()
+    
+    monkeypatch.undo()
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["d"]
+
+
+def test_reprocessing_a_recording_replaces_its_tasks(tmp_path):
+    storage = VoiceTaskStorage(str(tmp_path))
+    storage.append_tasks([_task("a1", "rec-a"), _task("a2", "rec-a")])
+    storage.append_tasks([_task("b1", "rec-b")])
+    storage.append_tasks([_task("a3", "rec-a")])
+    
+    assert _titles(storage.load_voice_tasks()) == ["b1", "a3"]
+    # A fresh instance replays the tombstone from disk
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["b1", "a3"]
+
+
+def test_torn_trailing_line_is_skipped(tmp_path):
+    storage = VoiceTaskStorage(str(tmp_path))
+    storage.append_tasks([_task("kept")])
+    with open(tmp_path / "voice_tasks.jsonl", "ab") as f:
+        f.write(b'{"title": "half wri')
+    
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["kept"]
+
+
+def test_compaction_waits_for_dead_lines_to_outnumber_live_tasks(tmp_path):
+    storage = VoiceTaskStorage(str(tmp_path))
+    log = tmp_path / "voice_tasks.jsonl"
+    storage.append_tasks([_task("a", "rec-a")])  # cold cache: tombstone written blind
+    storage.load_voice_tasks()
+    storage.append_tasks([_task("b", "rec-b")])  # 1 dead line, 2 live
+    
+    assert storage.compact_if_needed()
+    assert len(log.read_bytes().splitlines()) == 3
+    
+    storage.append_tasks([_task("b2", "rec-b")])  # tombstone + replaced task: 3 dead
+    assert storage.compact_if_needed()
+    assert len(log.read_bytes().splitlines()) == 2
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["a", "b2"]
+
+
+def test_cleanup_old_tasks_keeps_recent_and_undated(tmp_path):
+    storage = VoiceTaskStorage(str(tmp_path))
+    storage.append_tasks([
+        VoiceTaskExtended(title="ancient", date="2000-01-01", recording_id="r"),
+        VoiceTaskExtended(title="undated", recording_id="r"),
+        VoiceTaskExtended(title="future", date="2999-01-01", recording_id="r"),
+    ])
+    
+    assert storage.cleanup_old_tasks(days_to_keep=30)
+    assert _titles(VoiceTaskStorage(str(tmp_path)).load_voice_tasks()) == ["undated", "future"]